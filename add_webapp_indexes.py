@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Add Web App Indexes
+Creates the derived columns and indexes the Flask app's queries rely on (safe to re-run)
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.database.connection import db
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# (name, DDL) pairs, applied in order
+MIGRATIONS = [
+    (
+        'idx_programs_program_stats',
+        # Homepage counters: one scan of actual programs answers all four COUNT(*) FILTERs
+        """
+        CREATE INDEX IF NOT EXISTS idx_programs_program_stats
+        ON programs (confidence_score, (payment_min IS NOT NULL), (eligibility_raw IS NOT NULL))
+        WHERE content_type = 'program'
+        """
+    ),
+    (
+        'idx_programs_eligibility_gin',
+        # Program Finder flag predicates use jsonb containment (eligibility_parsed @> '{"flag": true}')
+        """
+        CREATE INDEX IF NOT EXISTS idx_programs_eligibility_gin
+        ON programs USING GIN (eligibility_parsed jsonb_path_ops)
+        WHERE content_type = 'program'
+        """
+    ),
+    (
+        'programs_category_column',
+        # Homepage / API category breakdown, derived once per row instead of per request
+        """
+        ALTER TABLE programs ADD COLUMN IF NOT EXISTS category TEXT GENERATED ALWAYS AS (
+          CASE
+            WHEN program_name LIKE '%Loan%' THEN 'Loan Programs'
+            WHEN program_name LIKE '%Conservation%' OR program_name LIKE '%CRP%' THEN 'Conservation'
+            WHEN program_name LIKE '%Emergency%' OR program_name LIKE '%Disaster%' THEN 'Disaster/Emergency'
+            WHEN program_name LIKE '%Marketing%' OR program_name LIKE '%Commodity%' THEN 'Marketing/Commodity'
+            WHEN program_name LIKE '%Payment%' OR program_name LIKE '%Eligibility%' THEN 'Payment/Eligibility'
+            ELSE 'Other'
+          END
+        ) STORED
+        """
+    ),
+    (
+        'idx_programs_category',
+        # GROUP BY category over confident programs can be answered from the index alone
+        """
+        CREATE INDEX IF NOT EXISTS idx_programs_category
+        ON programs (category, confidence_score)
+        WHERE content_type = 'program'
+        """
+    ),
+    (
+        'programs_search_tsv_column',
+        # Full-text document for /search and the /programs search box
+        """
+        ALTER TABLE programs ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS (
+          to_tsvector('english', COALESCE(program_name, '') || ' ' || COALESCE(description, ''))
+        ) STORED
+        """
+    ),
+    (
+        'idx_programs_search_tsv',
+        """
+        CREATE INDEX IF NOT EXISTS idx_programs_search_tsv
+        ON programs USING GIN (search_tsv)
+        WHERE content_type = 'program'
+        """
+    ),
+    (
+        'pg_trgm_extension',
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+    ),
+    (
+        'idx_programs_name_trgm',
+        # Substring (ILIKE '%q%') fallback for search terms full-text matching misses
+        """
+        CREATE INDEX IF NOT EXISTS idx_programs_name_trgm
+        ON programs USING GIN (program_name gin_trgm_ops)
+        WHERE content_type = 'program'
+        """
+    ),
+    (
+        'idx_programs_description_trgm',
+        """
+        CREATE INDEX IF NOT EXISTS idx_programs_description_trgm
+        ON programs USING GIN (description gin_trgm_ops)
+        WHERE content_type = 'program'
+        """
+    ),
+]
+
+
+def add_indexes():
+    """Apply all web app index migrations"""
+
+    db.connect()
+
+    for name, ddl in MIGRATIONS:
+        logger.info(f"Applying {name}...")
+        db.execute(ddl)
+
+    logger.info(f"✓ Applied {len(MIGRATIONS)} migrations")
+
+    db.close()
+
+
+if __name__ == '__main__':
+    add_indexes()
@@ -119,6 +119,17 @@ else
     echo "$(date '+%Y-%m-%d %H:%M:%S') - Database already has $PROGRAM_COUNT programs"
 fi
 
+# Derived columns and indexes the web app queries rely on (idempotent, so safe on
+# every start; manual_import.py also applies them right after importing)
+echo "$(date '+%Y-%m-%d %H:%M:%S') - Applying web app migrations..."
+set +e
+python3 add_webapp_indexes.py
+MIGRATE_EXIT=$?
+set -e
+if [ $MIGRATE_EXIT -ne 0 ]; then
+    echo "$(date '+%Y-%m-%d %H:%M:%S') - WARNING: Web app migrations failed with exit code $MIGRATE_EXIT"
+fi
+
 echo "$(date '+%Y-%m-%d %H:%M:%S') - ==================================="
 echo "$(date '+%Y-%m-%d %H:%M:%S') - Starting application"
 echo "$(date '+%Y-%m-%d %H:%M:%S') - ==================================="
@@ -20,7 +20,7 @@ def extract_better_description(raw_html: str, raw_text: str, program_name: str)
     2. Finding the main content area
     3. Extracting the first meaningful paragraph
     """
-    soup = BeautifulSoup(raw_html, 'html.parser')
+    soup = BeautifulSoup(raw_html, 'lxml')
 
     # Strategy 1: Look for sections with "What It Is" or similar headings
     what_it_is_section = soup.find(['h2', 'h3', 'h4'], text=re.compile(r'What It Is|Overview|Description|About', re.I))
@@ -79,5 +79,10 @@ def main():
             os.unlink(temp_file)
             print(f'Cleaned up temporary file')
 
+    # Derived columns and indexes the web app queries rely on (idempotent)
+    print('Applying web app migrations...')
+    from add_webapp_indexes import add_indexes
+    add_indexes()
+
 if __name__ == '__main__':
     main()
@@ -25,6 +25,8 @@ class Settings(BaseSettings):
     postgres_db: str = Field(default="farm_scraper")
     postgres_host: str = Field(default="localhost")
     postgres_port: int = Field(default=5432)
+    db_pool_min_connections: int = Field(default=4)
+    db_pool_max_connections: int = Field(default=16)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
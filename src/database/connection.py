@@ -2,14 +2,66 @@
 Database connection and session management
 """
 import psycopg2
+import psycopg2.extras
 from psycopg2.extras import RealDictCursor, Json
+from psycopg2.pool import ThreadedConnectionPool
 from contextlib import contextmanager
-from typing import Optional, Any, Dict, List
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional, Any, Dict, Iterator, List
+import hashlib
+import json
 import logging
+import re
+import threading
+import uuid
+import weakref
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+# orjson serializes large JSONB payloads (PDF tables, API records) much faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Decode json/jsonb columns (eligibility_parsed, json_agg results) with orjson on every connection
+if ORJSON_AVAILABLE:
+    psycopg2.extras.register_default_json(globally=True, loads=orjson.loads)
+    psycopg2.extras.register_default_jsonb(globally=True, loads=orjson.loads)
+
+
+def _json_default(obj: Any) -> Any:
+    """Convert values neither serializer handles natively (NUMERIC columns come back as Decimal)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize an object to JSON text, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits, which stdlib json still encodes
+    return json.dumps(obj, default=_json_default)
+
+
+def to_json(obj: Any) -> Json:
+    """Wrap an object for a JSON/JSONB query parameter"""
+    return Json(obj, dumps=json_dumps)
+
+
+# Prepared statements kept per connection before they are all deallocated
+PREPARED_STATEMENTS_PER_CONNECTION = 256
+
+PLACEHOLDER_RE = re.compile(r'%[s%]')
+
 
 class DatabaseConnection:
     """Manages PostgreSQL database connections"""
@@ -23,6 +75,11 @@ class DatabaseConnection:
             'port': settings.postgres_port,
         }
         self._connection: Optional[psycopg2.extensions.connection] = None
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        # connection -> names of statements PREPAREd on it (entries vanish with the connection)
+        self._prepared = weakref.WeakKeyDictionary()
+        self._prepared_lock = threading.Lock()
 
     def connect(self) -> psycopg2.extensions.connection:
         """Establish database connection"""
@@ -35,21 +92,74 @@ class DatabaseConnection:
             raise
 
     def close(self):
-        """Close database connection"""
+        """Close database connection and any pooled connections"""
         if self._connection:
             self._connection.close()
             logger.info("Database connection closed")
             self._connection = None
 
+        if self._pool:
+            self._pool.closeall()
+            logger.info("Database connection pool closed")
+            self._pool = None
+
+    def get_pool(self) -> ThreadedConnectionPool:
+        """Get the shared connection pool, creating it on first use"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    try:
+                        self._pool = ThreadedConnectionPool(
+                            settings.db_pool_min_connections,
+                            settings.db_pool_max_connections,
+                            **self.connection_params
+                        )
+                        logger.info("Database connection pool established")
+                    except psycopg2.Error as e:
+                        logger.error(f"Database connection pool failed: {e}")
+                        raise
+        return self._pool
+
     @contextmanager
-    def get_cursor(self, dict_cursor: bool = True):
+    def pooled_cursor(self, dict_cursor: bool = True):
+        """
+        Context manager for a cursor on a pooled connection
+
+        The connection is held for the whole block and committed once,
+        so batch writes pay for a single checkout and transaction.
+
+        Args:
+            dict_cursor: If True, return dict-like rows; otherwise return tuples
+        """
+        pool = self.get_pool()
+        conn = pool.getconn()
+        cursor_factory = RealDictCursor if dict_cursor else None
+
+        try:
+            cursor = conn.cursor(cursor_factory=cursor_factory)
+            try:
+                yield cursor
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Database error: {e}")
+                raise
+            finally:
+                cursor.close()
+        finally:
+            pool.putconn(conn)
+
+    @contextmanager
+    def get_cursor(self, dict_cursor: bool = True, conn: Optional[psycopg2.extensions.connection] = None):
         """
         Context manager for database cursor
 
         Args:
             dict_cursor: If True, return dict-like rows; otherwise return tuples
+            conn: Connection to use (e.g. one checked out of the pool);
+                  defaults to the shared connection
         """
-        conn = self._connection or self.connect()
+        conn = conn or self._connection or self.connect()
         cursor_factory = RealDictCursor if dict_cursor else None
 
         try:
@@ -63,23 +173,88 @@ class DatabaseConnection:
         finally:
             cursor.close()
 
-    def execute(self, query: str, params: Optional[tuple] = None) -> None:
+    def execute(self, query: str, params: Optional[tuple] = None, conn=None) -> None:
         """Execute a query without returning results"""
-        with self.get_cursor() as cursor:
+        with self.get_cursor(conn=conn) as cursor:
             cursor.execute(query, params)
 
-    def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
+    def fetch_one(self, query: str, params: Optional[tuple] = None, conn=None) -> Optional[Dict]:
         """Fetch a single row"""
-        with self.get_cursor() as cursor:
+        with self.get_cursor(conn=conn) as cursor:
             cursor.execute(query, params)
             return cursor.fetchone()
 
-    def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict]:
+    def fetch_all(self, query: str, params: Optional[tuple] = None, conn=None) -> List[Dict]:
         """Fetch all rows"""
-        with self.get_cursor() as cursor:
+        with self.get_cursor(conn=conn) as cursor:
             cursor.execute(query, params)
             return cursor.fetchall()
 
+    def fetch_all_prepared(self, query: str, params: Optional[tuple] = None, conn=None) -> List[Dict]:
+        """
+        Fetch all rows through a server-side prepared statement
+
+        Statements are named by a hash of the query text and PREPAREd once per
+        connection, so repeated queries of the same shape skip parsing and planning.
+        """
+        conn = conn or self._connection or self.connect()
+        params = tuple(params or ())
+        name = f"stmt_{hashlib.sha1(query.encode()).hexdigest()[:16]}"
+
+        with self._prepared_lock:
+            prepared = self._prepared.setdefault(conn, set())
+
+        with self.get_cursor(conn=conn) as cursor:
+            if name not in prepared:
+                if len(prepared) >= PREPARED_STATEMENTS_PER_CONNECTION:
+                    cursor.execute("DEALLOCATE ALL")
+                    prepared.clear()
+
+                # %s placeholders become $1..$n; %% is a literal %
+                numbers = iter(range(1, len(params) + 1))
+                statement = PLACEHOLDER_RE.sub(
+                    lambda m: '%' if m.group() == '%%' else f"${next(numbers)}", query
+                )
+                cursor.execute(f"PREPARE {name} AS {statement}")
+                prepared.add(name)
+
+            if params:
+                cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+            else:
+                cursor.execute(f"EXECUTE {name}")
+            return cursor.fetchall()
+
+    def iter_all(
+        self,
+        query: str,
+        params: Optional[tuple] = None,
+        conn=None,
+        itersize: int = 200
+    ) -> Iterator[Dict]:
+        """
+        Stream rows through a server-side (named) cursor
+
+        Rows are fetched from the server `itersize` at a time as the caller
+        iterates, so large result sets never sit fully in client memory.
+        """
+        conn = conn or self._connection or self.connect()
+        cursor = conn.cursor(name=f"iter_{uuid.uuid4().hex}", cursor_factory=RealDictCursor)
+        cursor.itersize = itersize
+
+        try:
+            cursor.execute(query, params)
+            yield from cursor
+            cursor.close()
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Database error: {e}")
+            raise
+        finally:
+            # A named cursor dies with its transaction, so only close it while that is still open
+            if not cursor.closed and conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                cursor.close()
+
     def insert(self, table: str, data: Dict[str, Any]) -> Optional[int]:
         """
         Insert a row and return the ID
@@ -98,7 +273,7 @@ class DatabaseConnection:
         values = []
         for v in data.values():
             if isinstance(v, (dict, list)):
-                values.append(Json(v))
+                values.append(to_json(v))
             else:
                 values.append(v)
         values = tuple(values)
@@ -133,7 +308,7 @@ class DatabaseConnection:
         converted_values = []
         for v in data.values():
             if isinstance(v, (dict, list)):
-                converted_values.append(Json(v))
+                converted_values.append(to_json(v))
             else:
                 converted_values.append(v)
 
@@ -172,8 +347,8 @@ class DatabaseConnection:
             'page_title': kwargs.get('page_title'),
             'raw_html': kwargs.get('raw_html'),
             'raw_text': kwargs.get('raw_text'),
-            'links': Json(kwargs.get('links', {})),
-            'metadata': Json(kwargs.get('metadata', {})),
+            'links': to_json(kwargs.get('links', {})),
+            'metadata': to_json(kwargs.get('metadata', {})),
         }
 
         with self.get_cursor() as cursor:
@@ -218,7 +393,7 @@ class DatabaseConnection:
             RETURNING id
         """
 
-        params = {k: Json(v) if k in ('eligibility_parsed', 'extraction_warnings') and v else v
+        params = {k: to_json(v) if k in ('eligibility_parsed', 'extraction_warnings') and v else v
                   for k, v in kwargs.items()}
 
         with self.get_cursor() as cursor:
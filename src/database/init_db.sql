@@ -51,6 +51,21 @@ CREATE TABLE IF NOT EXISTS programs (
     confidence_score FLOAT DEFAULT 0.0,  -- 0-1 score on extraction quality
     extraction_warnings JSONB,  -- Issues found during parsing
 
+    -- Derived fields (web app; keep in sync with add_webapp_indexes.py)
+    category TEXT GENERATED ALWAYS AS (
+      CASE
+        WHEN program_name LIKE '%Loan%' THEN 'Loan Programs'
+        WHEN program_name LIKE '%Conservation%' OR program_name LIKE '%CRP%' THEN 'Conservation'
+        WHEN program_name LIKE '%Emergency%' OR program_name LIKE '%Disaster%' THEN 'Disaster/Emergency'
+        WHEN program_name LIKE '%Marketing%' OR program_name LIKE '%Commodity%' THEN 'Marketing/Commodity'
+        WHEN program_name LIKE '%Payment%' OR program_name LIKE '%Eligibility%' THEN 'Payment/Eligibility'
+        ELSE 'Other'
+      END
+    ) STORED,
+    search_tsv tsvector GENERATED ALWAYS AS (
+      to_tsvector('english', COALESCE(program_name, '') || ' ' || COALESCE(description, ''))
+    ) STORED,
+
     UNIQUE(program_code, source_url)
 );
 
@@ -61,7 +61,7 @@ class ProgramExtractor:
         Returns:
             Dictionary of extracted program data
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, 'lxml')
         text = soup.get_text()
 
         program_data = {
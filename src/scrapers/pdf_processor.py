@@ -4,13 +4,16 @@ Downloads and extracts text and tables from PDF documents
 """
 import asyncio
 import logging
+import re
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import httpx
 from datetime import datetime
 
 from src.config import settings
-from src.database.connection import db
+from src.database.connection import db, to_json
+from src.scrapers.rate_limiter import get_bucket
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +25,23 @@ except ImportError:
     logger.warning("pdfplumber not available")
     PDFPLUMBER_AVAILABLE = False
 
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    logger.warning("PyMuPDF not available - all PDFs will go through pdfplumber")
+    PYMUPDF_AVAILABLE = False
+
+# PyMuPDF and pypdfium2 aren't thread-safe, and process_pdf runs in concurrent
+# asyncio.to_thread workers, so every call into either library happens under this lock
+NATIVE_PDF_LOCK = threading.Lock()
+
+try:
+    import pypdfium2
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
 try:
     import camelot
     CAMELOT_AVAILABLE = True
@@ -33,6 +53,15 @@ except ImportError:
 class PDFProcessor:
     """Download and process PDF documents"""
 
+    # Pages opened per pdfplumber document, bounding its per-document caches
+    PAGE_SLICE_SIZE = 25
+
+    # Payment-related header keywords (substring match, as "rates" or "payments" should count)
+    PAYMENT_RE = re.compile(
+        r'payment|rate|amount|\$|per acre|subsidy|cost|price|reimbursement',
+        re.IGNORECASE
+    )
+
     def __init__(self):
         self.pdf_dir = settings.pdf_dir
         self.pdf_dir.mkdir(parents=True, exist_ok=True)
@@ -61,6 +90,9 @@ class PDFProcessor:
                 logger.info(f"PDF already exists: {filename}")
                 return local_path
 
+            # Respectful rate limit (shared across concurrent downloads per host)
+            await get_bucket(url).acquire()
+
             logger.info(f"Downloading PDF: {url}")
 
             async with httpx.AsyncClient(timeout=60) as client:
@@ -97,10 +129,24 @@ class PDFProcessor:
             'page_count': 0,
         }
 
-        # Try pdfplumber first (fastest and most reliable)
+        scan = self._classify_pdf(pdf_path) if PYMUPDF_AVAILABLE else None
+        pdf_kind = scan['kind'] if scan else 'ruled'
+
+        # No text layer: pdfplumber and camelot would only burn time finding nothing
+        if pdf_kind == 'scanned':
+            logger.info(f"No text layer in {pdf_path.name} - needs OCR, skipping extraction")
+            result['extraction_method'] = 'needs_ocr'
+            return result
+
+        # Text without ruling lines: pdfplumber's line-based table finder has nothing
+        # to work with, so the text PyMuPDF already read is the result
+        if pdf_kind == 'text':
+            return self._extract_with_pymupdf(scan)
+
+        # Ruled tables (or fast path failed): pdfplumber
         if PDFPLUMBER_AVAILABLE:
             try:
-                result = self._extract_with_pdfplumber(pdf_path)
+                result = self._extract_with_pdfplumber(pdf_path, scan['page_count'] if scan else None)
                 if result['success']:
                     return result
             except Exception as e:
@@ -117,8 +163,59 @@ class PDFProcessor:
 
         return result
 
-    def _extract_with_pdfplumber(self, pdf_path: Path) -> Dict[str, Any]:
-        """Extract using pdfplumber"""
+    def _classify_pdf(self, pdf_path: Path) -> Dict[str, Any]:
+        """
+        Sniff a PDF with PyMuPDF to pick an extractor
+
+        Every page is checked, as a table or text layer may only start late in the document.
+        The text read along the way is kept, so the text-only path doesn't extract it again.
+
+        Returns:
+            Dictionary with 'kind' ('scanned' = no text layer, 'ruled' = vector lines/rects,
+            likely tables, 'text' = text only), 'page_count' and per-page 'text_pages'
+        """
+        text_pages = []
+        has_lines = False
+
+        try:
+            with NATIVE_PDF_LOCK, fitz.open(pdf_path) as doc:
+                page_count = doc.page_count
+
+                for page_num, page in enumerate(doc, 1):
+                    page_text = page.get_text().strip()
+                    if page_text:
+                        text_pages.append(f"\n--- Page {page_num} ---\n{page_text}")
+                    has_lines = has_lines or bool(page.get_drawings())
+
+                    # Ruled with a text layer: pdfplumber re-reads it, so stop here
+                    if has_lines and text_pages:
+                        break
+
+        except Exception as e:
+            logger.debug(f"Could not classify {pdf_path.name}: {e}")
+            return {'kind': 'ruled', 'page_count': None, 'text_pages': []}
+
+        if not text_pages:
+            kind = 'scanned'
+        else:
+            kind = 'ruled' if has_lines else 'text'
+
+        return {'kind': kind, 'page_count': page_count, 'text_pages': text_pages}
+
+    def _extract_with_pymupdf(self, scan: Dict[str, Any]) -> Dict[str, Any]:
+        """Text-only result from the pages PyMuPDF read while classifying"""
+        text = '\n'.join(scan['text_pages'])
+
+        return {
+            'text': text,
+            'tables': [],
+            'extraction_method': 'pymupdf',
+            'success': bool(text),
+            'page_count': scan['page_count'],
+        }
+
+    def _extract_with_pdfplumber(self, pdf_path: Path, page_count: Optional[int] = None) -> Dict[str, Any]:
+        """Extract using pdfplumber (page_count, when already known, saves counting again)"""
         result = {
             'text': '',
             'tables': [],
@@ -127,33 +224,77 @@ class PDFProcessor:
             'page_count': 0,
         }
 
-        with pdfplumber.open(pdf_path) as pdf:
-            result['page_count'] = len(pdf.pages)
-            text_pages = []
-
-            for page_num, page in enumerate(pdf.pages, 1):
-                # Extract text
-                page_text = page.extract_text()
-                if page_text:
-                    text_pages.append(f"\n--- Page {page_num} ---\n{page_text}")
-
-                # Extract tables
-                tables = page.extract_tables()
-                if tables:
-                    for table_num, table in enumerate(tables, 1):
-                        result['tables'].append({
-                            'page': page_num,
-                            'table_num': table_num,
-                            'data': table,
-                            'headers': table[0] if table else [],
-                            'rows': table[1:] if len(table) > 1 else []
-                        })
-
-            result['text'] = '\n'.join(text_pages)
-            result['success'] = bool(result['text'])
+        if page_count is None:
+            page_count = self._get_page_count(pdf_path)
+        result['page_count'] = page_count
+        text_pages = []
+
+        # Open the PDF in slices so pdfplumber never holds every page of a long document
+        for start in range(1, page_count + 1, self.PAGE_SLICE_SIZE):
+            page_numbers = list(range(start, min(start + self.PAGE_SLICE_SIZE, page_count + 1)))
+
+            with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+                for page in pdf.pages:
+                    page_num = page.page_number
+
+                    # Extract raw text only: no layout-preserving padding or text-flow reordering
+                    page_text = page.extract_text(
+                        layout=False,
+                        x_tolerance=3,
+                        y_tolerance=3,
+                        use_text_flow=False
+                    )
+                    if page_text:
+                        text_pages.append(f"\n--- Page {page_num} ---\n{page_text}")
+
+                    # Extract tables
+                    tables = page.extract_tables()
+                    if tables:
+                        for table_num, table in enumerate(tables, 1):
+                            result['tables'].append({
+                                'page': page_num,
+                                'table_num': table_num,
+                                'data': table,
+                                'headers': table[0] if table else [],
+                                'rows': table[1:] if len(table) > 1 else []
+                            })
+
+                    # Drop cached chars/lines/rects so memory stays flat on long PDFs
+                    self._release_page(page)
+
+        result['text'] = '\n'.join(text_pages)
+        result['success'] = bool(result['text'])
 
         return result
 
+    def _get_page_count(self, pdf_path: Path) -> int:
+        """Count pages without building pdfplumber page objects"""
+        if PDFIUM_AVAILABLE:
+            try:
+                with NATIVE_PDF_LOCK:
+                    pdf = pypdfium2.PdfDocument(str(pdf_path))
+                    try:
+                        return len(pdf)
+                    finally:
+                        pdf.close()
+            except Exception as e:
+                logger.debug(f"pypdfium2 page count failed for {pdf_path.name}: {e}")
+
+        with pdfplumber.open(pdf_path) as pdf:
+            return len(pdf.pages)
+
+    def _release_page(self, page):
+        """Release a processed pdfplumber page's cached layout objects"""
+        if hasattr(page, 'close'):
+            page.close()
+        else:
+            page.flush_cache()
+
+        # Newer pdfplumber versions also memoize the page text map
+        get_textmap = getattr(page, 'get_textmap', None)
+        if hasattr(get_textmap, 'cache_clear'):
+            get_textmap.cache_clear()
+
     def _extract_tables_with_camelot(self, pdf_path: Path) -> List[Dict]:
         """Extract tables using camelot"""
         tables_data = []
@@ -195,17 +336,8 @@ class PDFProcessor:
             if not headers and table.get('data'):
                 headers = table['data'][0] if table['data'] else []
 
-            # Convert headers to string for searching
-            headers_str = ' '.join(str(h).lower() for h in headers if h)
-
-            # Payment-related keywords
-            payment_keywords = [
-                'payment', 'rate', 'amount', '$', 'per acre',
-                'subsidy', 'cost', 'price', 'reimbursement'
-            ]
-
             # Check if table contains payment information
-            if any(keyword in headers_str for keyword in payment_keywords):
+            if any(self.PAYMENT_RE.search(str(h)) for h in headers if h):
                 payment_tables.append({
                     'page': table.get('page'),
                     'table_num': table.get('table_num'),
@@ -242,9 +374,7 @@ class PDFProcessor:
                 RETURNING id
             """
 
-            from psycopg2.extras import Json
-
-            with db.get_cursor() as cursor:
+            with db.pooled_cursor() as cursor:
                 cursor.execute(query, (
                     url,
                     local_path.name,
@@ -256,8 +386,8 @@ class PDFProcessor:
                     extracted_data['extraction_method'],
                     extracted_data['page_count'],
                     extracted_data['text'],
-                    Json(extracted_data['tables']),
-                    Json({'processed_at': datetime.now().isoformat()})
+                    to_json(extracted_data['tables']),
+                    to_json({'processed_at': datetime.now().isoformat()})
                 ))
 
                 result = cursor.fetchone()
@@ -283,11 +413,8 @@ class PDFProcessor:
             if not local_path:
                 return False
 
-            # Respectful delay
-            await asyncio.sleep(settings.scrape_delay_seconds)
-
-            # Extract
-            extracted_data = self.process_pdf(local_path)
+            # Extract on a worker thread so other downloads keep progressing
+            extracted_data = await asyncio.to_thread(self.process_pdf, local_path)
 
             # Save to database
             await self.save_to_database(url, local_path, extracted_data)
@@ -320,9 +447,23 @@ async def process_discovered_pdfs():
     """
 
     results = db.fetch_all(query)
-    pdf_urls = [r['pdf_url'] for r in results]
 
-    logger.info(f"Found {len(pdf_urls)} PDFs to process")
+    # Dedupe while keeping discovery order
+    pdf_urls = list(dict.fromkeys(r['pdf_url'] for r in results))
+
+    # Skip PDFs a previous run extracted (one query instead of a download each);
+    # failed and needs-OCR rows stay eligible for retry
+    existing = db.fetch_all(
+        "SELECT source_url FROM documents WHERE source_url = ANY(%s) AND text_extracted",
+        (pdf_urls,)
+    ) if pdf_urls else []
+    existing_urls = {r['source_url'] for r in existing}
+    pdf_urls = [url for url in pdf_urls if url not in existing_urls]
+
+    logger.info(
+        f"Found {len(pdf_urls)} PDFs to process "
+        f"({len(existing_urls)} already processed)"
+    )
 
     processor = PDFProcessor()
 
@@ -0,0 +1,76 @@
+"""
+Per-host rate limiting for scrapers
+Token-bucket limiter shared by all concurrent tasks hitting the same host
+"""
+import asyncio
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from src.config import settings
+
+
+class TokenBucket:
+    """
+    Async token bucket
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    Each request consumes one token, so concurrent callers share an
+    aggregate requests-per-second budget instead of each sleeping a fixed delay.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def acquire(self):
+        """Wait until a token is available, then consume it"""
+        # Buckets are module-level, so rebind the lock if a new event loop is running
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                # Holding the lock while waiting keeps callers in FIFO order
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+
+
+def get_bucket(url: str, rate: Optional[float] = None) -> TokenBucket:
+    """
+    Get the shared token bucket for a URL's host
+
+    Args:
+        url: Any URL on the host (or a bare host name)
+        rate: Requests per second (default: 1 / scrape_delay_seconds)
+
+    Returns:
+        TokenBucket shared by all callers for that host
+    """
+    host = urlparse(url).netloc or url
+
+    if host not in _buckets:
+        if rate is None:
+            rate = 1 / max(settings.scrape_delay_seconds, 0.001)
+        _buckets[host] = TokenBucket(rate, capacity=settings.max_concurrent_requests)
+
+    return _buckets[host]
@@ -4,17 +4,55 @@ Handles NASS QuickStats API and EWG subsidy database
 """
 import asyncio
 import logging
+from io import StringIO
 from typing import Dict, List, Optional
 import httpx
 from datetime import datetime
 from bs4 import BeautifulSoup
-from psycopg2.extras import Json
+from psycopg2.extras import execute_values
 
 from src.config import settings
-from src.database.connection import db
+from src.database.connection import db, to_json
+from src.scrapers.rate_limiter import get_bucket
 
 logger = logging.getLogger(__name__)
 
+# pandas.read_html parses EWG tables with lxml's C parser when available
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    logger.warning("pandas not available - EWG tables will be parsed with BeautifulSoup")
+    PANDAS_AVAILABLE = False
+
+
+def _upsert_rows(query: str, rows: List[tuple], label: str) -> int:
+    """
+    Upsert rows with one execute_values batch, returning how many were saved
+
+    The batch is a single transaction, so if it fails the rows are retried one
+    per transaction: a bad record is logged and skipped instead of losing the rest.
+    """
+    try:
+        with db.pooled_cursor() as cursor:
+            execute_values(cursor, query, rows, page_size=500)
+        return len(rows)
+
+    except Exception as e:
+        logger.warning(f"Batch save of {label} records failed ({e}), retrying row by row")
+
+    saved_count = 0
+    for row in rows:
+        try:
+            with db.pooled_cursor() as cursor:
+                execute_values(cursor, query, [row])
+            saved_count += 1
+
+        except Exception as e:
+            logger.error(f"Error saving {label} record {row[:3]}: {e}")
+
+    return saved_count
+
 
 class NASSQuickStatsAPI:
     """NASS QuickStats API client"""
@@ -51,57 +89,81 @@ class NASSQuickStatsAPI:
         all_data = []
 
         async with httpx.AsyncClient(timeout=settings.timeout_seconds) as client:
-            for commodity in commodities:
-                for year in range(year_start, year_end + 1):
-                    try:
-                        params = {
-                            'key': self.api_key,
-                            'source_desc': 'SURVEY',
-                            'sector_desc': 'CROPS',
-                            'commodity_desc': commodity,
-                            'state_alpha': state,
-                            'year': year,
-                            'agg_level_desc': 'COUNTY',
-                            'format': 'JSON'
-                        }
-
-                        logger.info(f"Fetching NASS data: {commodity} {year} {state}")
-                        response = await client.get(self.BASE_URL, params=params)
-                        response.raise_for_status()
+            # Dispatch every (commodity, year) request at once; the host's
+            # token bucket keeps the aggregate request rate polite
+            tasks = [
+                self._fetch_one(client, commodity, year, state)
+                for commodity in commodities
+                for year in range(year_start, year_end + 1)
+            ]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error(f"Unexpected error: {result}")
+            else:
+                all_data.extend(result)
 
-                        data = response.json()
-                        if 'data' in data:
-                            all_data.extend(data['data'])
-                            logger.info(f"Retrieved {len(data['data'])} records for {commodity} {year}")
-
-                        # Respectful delay
-                        await asyncio.sleep(settings.scrape_delay_seconds)
+        return all_data
 
-                    except httpx.HTTPError as e:
-                        logger.error(f"Error fetching NASS data for {commodity} {year}: {e}")
-                    except Exception as e:
-                        logger.error(f"Unexpected error: {e}")
+    async def _fetch_one(
+        self,
+        client: httpx.AsyncClient,
+        commodity: str,
+        year: int,
+        state: str
+    ) -> List[Dict]:
+        """Fetch NASS records for a single commodity/year"""
+        try:
+            params = {
+                'key': self.api_key,
+                'source_desc': 'SURVEY',
+                'sector_desc': 'CROPS',
+                'commodity_desc': commodity,
+                'state_alpha': state,
+                'year': year,
+                'agg_level_desc': 'COUNTY',
+                'format': 'JSON'
+            }
+
+            # Respectful rate limit (shared across concurrent requests)
+            await get_bucket(self.BASE_URL).acquire()
+
+            logger.info(f"Fetching NASS data: {commodity} {year} {state}")
+            response = await client.get(self.BASE_URL, params=params)
+            response.raise_for_status()
+
+            data = response.json()
+            if 'data' in data:
+                logger.info(f"Retrieved {len(data['data'])} records for {commodity} {year}")
+                return data['data']
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching NASS data for {commodity} {year}: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
 
-        return all_data
+        return []
 
     async def save_to_database(self, data: List[Dict]) -> int:
         """Save NASS data to database"""
-        saved_count = 0
+        query = """
+            INSERT INTO nass_data (
+                state, county, year, commodity, data_item,
+                value, unit, source_desc, raw_response
+            )
+            VALUES %s
+            ON CONFLICT (state, county, year, commodity, data_item) DO UPDATE
+            SET value = EXCLUDED.value,
+                unit = EXCLUDED.unit,
+                fetched_at = NOW()
+        """
 
+        # Keyed by the conflict target: a single INSERT can't update the same row twice,
+        # so later records win as they did with row-by-row upserts
+        rows = {}
         for record in data:
             try:
-                query = """
-                    INSERT INTO nass_data (
-                        state, county, year, commodity, data_item,
-                        value, unit, source_desc, raw_response
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (state, county, year, commodity, data_item) DO UPDATE
-                    SET value = EXCLUDED.value,
-                        unit = EXCLUDED.unit,
-                        fetched_at = NOW()
-                """
-
                 params = (
                     record.get('state_alpha'),
                     record.get('county_name'),
@@ -111,15 +173,14 @@ class NASSQuickStatsAPI:
                     float(record.get('Value', 0)) if record.get('Value') else None,
                     record.get('unit_desc'),
                     record.get('source_desc'),
-                    Json(record)
+                    to_json(record)
                 )
-
-                with db.get_cursor() as cursor:
-                    cursor.execute(query, params)
-                    saved_count += 1
+                rows[params[:5]] = params
 
             except Exception as e:
-                logger.error(f"Error saving NASS record: {e}")
+                logger.error(f"Error preparing NASS record: {e}")
+
+        saved_count = _upsert_rows(query, list(rows.values()), 'NASS') if rows else 0
 
         logger.info(f"Saved {saved_count} NASS records to database")
         return saved_count
@@ -151,40 +212,114 @@ class EWGSubsidyDatabase:
         all_payments = []
 
         async with httpx.AsyncClient(timeout=settings.timeout_seconds) as client:
-            for year in range(year_start, year_end + 1):
-                try:
-                    # Build search URL
-                    params = {
-                        'fips': '00000',  # All counties
-                        'state': state,
-                        'year': year,
-                        'regionname': state
-                    }
-
-                    logger.info(f"Fetching EWG data for {state} {year}")
-                    response = await client.get(self.SEARCH_URL, params=params)
-                    response.raise_for_status()
-
-                    # Parse HTML response
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    payment_data = self._parse_payment_page(soup, state, year)
-
-                    if payment_data:
-                        all_payments.extend(payment_data)
-                        logger.info(f"Extracted {len(payment_data)} payment records for {year}")
-
-                    # Respectful delay
-                    await asyncio.sleep(settings.scrape_delay_seconds)
-
-                except httpx.HTTPError as e:
-                    logger.error(f"Error fetching EWG data for {year}: {e}")
-                except Exception as e:
-                    logger.error(f"Unexpected error: {e}")
+            tasks = [
+                self._fetch_year(client, state, year)
+                for year in range(year_start, year_end + 1)
+            ]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error(f"Unexpected error: {result}")
+            else:
+                all_payments.extend(result)
 
         return all_payments
 
-    def _parse_payment_page(self, soup: BeautifulSoup, state: str, year: int) -> List[Dict]:
+    async def _fetch_year(self, client: httpx.AsyncClient, state: str, year: int) -> List[Dict]:
+        """Fetch EWG payment records for a single year"""
+        try:
+            # Build search URL
+            params = {
+                'fips': '00000',  # All counties
+                'state': state,
+                'year': year,
+                'regionname': state
+            }
+
+            # Respectful rate limit (shared across concurrent requests)
+            await get_bucket(self.BASE_URL).acquire()
+
+            logger.info(f"Fetching EWG data for {state} {year}")
+            response = await client.get(self.SEARCH_URL, params=params)
+            response.raise_for_status()
+
+            # Parse HTML response
+            payment_data = self._parse_payment_page(response.text, state, year)
+
+            if payment_data:
+                logger.info(f"Extracted {len(payment_data)} payment records for {year}")
+                return payment_data
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching EWG data for {year}: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+
+        return []
+
+    def _parse_payment_page(self, html: str, state: str, year: int) -> List[Dict]:
         """Parse payment data from EWG HTML page"""
+        if PANDAS_AVAILABLE:
+            try:
+                return self._parse_payment_tables(html, state, year)
+            except Exception as e:
+                logger.debug(f"pandas table parsing failed, falling back to BeautifulSoup: {e}")
+
+        return self._parse_payment_soup(BeautifulSoup(html, 'lxml'), state, year)
+
+    def _parse_payment_tables(self, html: str, state: str, year: int) -> List[Dict]:
+        """Parse payment tables with pandas.read_html and vectorized cleanup"""
+        payments = []
+
+        frames = pd.read_html(StringIO(html), attrs={'class': 'datatable'}, flavor='lxml')
+
+        for df in frames:
+            if df.shape[1] < 4:
+                continue
+
+            # No <th> header: read_html numbers the columns and keeps the header as a data row
+            if pd.api.types.is_integer_dtype(df.columns):
+                df = df.iloc[1:]
+
+            df = df.iloc[:, :4].dropna(how='all')
+            program_col, total_col, count_col, average_col = df.columns
+
+            records = pd.DataFrame({
+                'state': state,
+                'year': year,
+                'program_name': df[program_col].fillna('').astype(str).str.strip(),
+                'total_payments': self._parse_numeric_series(df[total_col]),
+                'recipient_count': self._parse_count_series(df[count_col]),
+                'average_payment': self._parse_numeric_series(df[average_col]),
+                'source': 'EWG'
+            })
+
+            # Not payment rows (the BeautifulSoup parser's 4-cell rule skips these):
+            # short, heading and notes rows leave every amount unparseable, and read_html
+            # copies a colspan label into the columns it spans
+            amounts = records[['total_payments', 'recipient_count', 'average_payment']]
+            spanned_label = df[program_col].astype(str).eq(df[total_col].astype(str)).fillna(False)
+            records = records[amounts.notna().any(axis=1) & ~spanned_label]
+
+            # NaN/NA -> None so psycopg2 writes NULL
+            records = records.astype(object).where(records.notna(), None)
+            payments.extend(records.to_dict(orient='records'))
+
+        return payments
+
+    def _parse_numeric_series(self, series: 'pd.Series') -> 'pd.Series':
+        """Strip currency formatting and convert a column to numbers (NaN if unparseable)"""
+        cleaned = series.astype(str).str.replace(r'[$,]', '', regex=True).str.strip()
+        return pd.to_numeric(cleaned, errors='coerce')
+
+    def _parse_count_series(self, series: 'pd.Series') -> 'pd.Series':
+        """Convert a count column to integers (NA unless a whole number, like _parse_number)"""
+        numbers = self._parse_numeric_series(series)
+        return numbers.where(numbers % 1 == 0).astype('Int64')
+
+    def _parse_payment_soup(self, soup: BeautifulSoup, state: str, year: int) -> List[Dict]:
+        """Parse payment data row by row with BeautifulSoup"""
         payments = []
 
         try:
@@ -231,23 +366,22 @@ class EWGSubsidyDatabase:
 
     async def save_to_database(self, payments: List[Dict]) -> int:
         """Save EWG payment data to database"""
-        saved_count = 0
+        query = """
+            INSERT INTO historical_payments (
+                program_name, year, state, total_payments,
+                recipient_count, average_payment, source
+            )
+            VALUES %s
+            ON CONFLICT (program_name, year, state, county, source) DO UPDATE
+            SET total_payments = EXCLUDED.total_payments,
+                recipient_count = EXCLUDED.recipient_count,
+                average_payment = EXCLUDED.average_payment
+        """
 
+        rows = []
         for payment in payments:
             try:
-                query = """
-                    INSERT INTO historical_payments (
-                        program_name, year, state, total_payments,
-                        recipient_count, average_payment, source
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (program_name, year, state, county, source) DO UPDATE
-                    SET total_payments = EXCLUDED.total_payments,
-                        recipient_count = EXCLUDED.recipient_count,
-                        average_payment = EXCLUDED.average_payment
-                """
-
-                params = (
+                rows.append((
                     payment['program_name'],
                     payment['year'],
                     payment['state'],
@@ -255,14 +389,12 @@ class EWGSubsidyDatabase:
                     payment.get('recipient_count'),
                     payment.get('average_payment'),
                     payment['source']
-                )
-
-                with db.get_cursor() as cursor:
-                    cursor.execute(query, params)
-                    saved_count += 1
+                ))
 
             except Exception as e:
-                logger.error(f"Error saving EWG payment record: {e}")
+                logger.error(f"Error preparing EWG payment record: {e}")
+
+        saved_count = _upsert_rows(query, rows, 'EWG payment') if rows else 0
 
         logger.info(f"Saved {saved_count} EWG payment records to database")
         return saved_count
@@ -0,0 +1,55 @@
+"""Tests for EWG payment table parsing"""
+from src.scrapers.tier1_api import EWGSubsidyDatabase
+
+ROWS = """
+<tr><td>Price Loss Coverage</td><td>$1,234,567</td><td>1,024</td><td>$1,205.63</td></tr>
+<tr><td>Conservation Reserve Program</td><td>$89,000</td><td>12</td><td>$7,416.67</td></tr>
+"""
+
+
+def _parse(header_row: str):
+    html = f'<table class="datatable">{header_row}{ROWS}</table>'
+    return EWGSubsidyDatabase()._parse_payment_tables(html, 'ND', 2023)
+
+
+def test_th_header_is_not_a_record():
+    payments = _parse('<tr><th>Program</th><th>Total</th><th>Recipients</th><th>Average</th></tr>')
+
+    assert [p['program_name'] for p in payments] == [
+        'Price Loss Coverage', 'Conservation Reserve Program'
+    ]
+    assert payments[0]['total_payments'] == 1234567
+    assert payments[0]['recipient_count'] == 1024
+
+
+def test_td_header_is_not_a_record():
+    payments = _parse('<tr><td>Program</td><td>Total</td><td>Recipients</td><td>Average</td></tr>')
+
+    assert [p['program_name'] for p in payments] == [
+        'Price Loss Coverage', 'Conservation Reserve Program'
+    ]
+    assert payments[1]['average_payment'] == 7416.67
+
+
+def test_short_and_colspan_rows_are_not_records():
+    payments = _parse(
+        '<tr><th>Program</th><th>Total</th><th>Recipients</th><th>Average</th></tr>'
+        '<tr><td>Commodity programs</td></tr>'
+        '<tr><td colspan="4">Source: USDA, compiled by EWG</td></tr>'
+        '<tr><td colspan="2">Subtotal</td><td>1,036</td><td>$1,277.63</td></tr>'
+    )
+
+    assert [p['program_name'] for p in payments] == [
+        'Price Loss Coverage', 'Conservation Reserve Program'
+    ]
+
+
+def test_fractional_count_is_not_rounded():
+    payments = _parse(
+        '<tr><th>Program</th><th>Total</th><th>Recipients</th><th>Average</th></tr>'
+        '<tr><td>Dairy Margin Coverage</td><td>$5,000</td><td>12.5</td><td>$400</td></tr>'
+    )
+
+    dairy = next(p for p in payments if p['program_name'] == 'Dairy Margin Coverage')
+    assert dairy['total_payments'] == 5000
+    assert dairy['recipient_count'] is None
@@ -0,0 +1,42 @@
+"""Tests for conditional GETs on compressed web app responses"""
+from datetime import datetime
+
+import pytest
+
+from webapp import app as webapp
+
+GZIP = {'Accept-Encoding': 'gzip'}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Fixed data version, so these tests don't need a database
+    monkeypatch.setattr(webapp, 'get_data_version', lambda: datetime(2024, 1, 1))
+    return webapp.app.test_client()
+
+
+def test_stats_revalidation_is_not_modified_when_gzipped(client, monkeypatch):
+    renders = []
+
+    def compute_stats(version):
+        renders.append(version)
+        return {'total_programs': 1, 'categories': [{'category': 'Other', 'count': n} for n in range(100)]}
+
+    monkeypatch.setattr(webapp, '_compute_stats', compute_stats)
+
+    response = client.get('/api/stats', headers=GZIP)
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+    revalidated = client.get('/api/stats', headers={**GZIP, 'If-None-Match': response.headers['ETag']})
+    assert revalidated.status_code == 304
+    assert len(renders) == 1
+
+
+def test_finder_revalidation_is_not_modified_when_gzipped(client):
+    response = client.get('/finder', headers=GZIP)
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+    revalidated = client.get('/finder', headers={**GZIP, 'If-None-Match': response.headers['ETag']})
+    assert revalidated.status_code == 304
@@ -9,37 +9,158 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from flask import Flask, render_template, request, jsonify
-from src.database.connection import db
+from flask import Flask, render_template, stream_template, request, jsonify, g, url_for, make_response
+from flask.json.provider import DefaultJSONProvider
+from cachetools import TTLCache, cached
+from jinja2 import FileSystemBytecodeCache
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Annotated, List, Mapping, Optional
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
+from src.database.connection import db, json_dumps
+import hashlib
 import logging
 import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    logger.warning("orjson not available - API responses will use the stdlib json encoder")
+    ORJSON_AVAILABLE = False
+
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    logger.warning("flask-compress not available - responses will be sent uncompressed")
+    COMPRESS_AVAILABLE = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson (used by jsonify)"""
+
+    def dumps(self, obj, **kwargs):
+        # jsonify asks for compact separators, which is what orjson writes; debug
+        # pretty-printing and other stdlib-only kwargs keep the default encoder
+        if not ORJSON_AVAILABLE or kwargs not in ({}, {'separators': (',', ':')}):
+            return super().dumps(obj, **kwargs)
+
+        # Dates go through Flask's default too, which writes HTTP dates rather than ISO-8601
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        # Types orjson doesn't know (Decimal, ...) go through Flask's default conversions
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['JSON_SORT_KEYS'] = False
 
-logger = logging.getLogger(__name__)
+# gzip/brotli for HTML and JSON responses. Streamed pages (/programs) stay uncompressed:
+# compressing them would buffer the rows the stream is meant to flush early.
+if COMPRESS_AVAILABLE:
+    app.config['COMPRESS_STREAMS'] = False
+    Compress(app)
 
-# Lazy database connection - only connect when needed
+# Flask-Compress appends ':<algorithm>' to the ETag of a compressed response ("abc:gzip").
+# Revalidations echo that back, so the suffix is dropped before any ETag comparison.
+COMPRESSED_ETAG_SUFFIX_RE = re.compile(r':(?:gzip|br|deflate|zstd)"')
+
+
+@app.before_request
+def strip_compressed_etag_suffix():
+    """Let If-None-Match from a compressed response match the page's own ETag"""
+    if_none_match = request.environ.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        request.environ['HTTP_IF_NONE_MATCH'] = COMPRESSED_ETAG_SUFFIX_RE.sub('"', if_none_match)
+
+# Persist compiled templates so fresh workers skip parsing/compiling Jinja source
+JINJA_CACHE_DIR = Path(tempfile.gettempdir()) / 'fsa_jinja_cache'
+JINJA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(str(JINJA_CACHE_DIR))
+
+# Each request checks a connection out of the shared pool on first use
+# and returns it on teardown, so concurrent requests don't share one connection
 def get_db():
-    """Get database connection, connecting if not already connected"""
-    if not db._connection:
+    """Get this request's pooled database connection"""
+    if 'db_conn' not in g:
         try:
-            db.connect()
+            g.db_conn = db.get_pool().getconn()
         except Exception as e:
             logger.error(f"Database connection failed: {e}")
             raise
-    return db
+    return g.db_conn
+
+
+@app.teardown_request
+def release_db(exception=None):
+    """Return the request's connection to the pool"""
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        db.get_pool().putconn(conn, close=bool(conn.closed))
+
+
+# Per-user result pages: validated by a hash of their body. after_request hooks run in
+# reverse registration order, so this one sees the body before compression.
+ETAG_ENDPOINTS = frozenset({'finder', 'my_programs'})
+
 
+@app.after_request
+def add_page_etag(response):
+    """Weak ETag on finder / my-programs pages, answering 304 when the client's copy matches"""
+    if request.endpoint in ETAG_ENDPOINTS and response.status_code == 200 and not response.is_streamed:
+        response.add_etag(weak=True)
+        return response.make_conditional(request)
+    return response
 
-def format_eligibility_text(eligibility_raw: str) -> dict:
+
+def fetch_one(query: str, params=None):
+    """Fetch a single row on this request's connection"""
+    return db.fetch_one(query, params, conn=get_db())
+
+
+def fetch_all(query: str, params=None):
+    """Fetch all rows on this request's connection"""
+    return db.fetch_all(query, params, conn=get_db())
+
+
+def fetch_all_prepared(query: str, params=None):
+    """Fetch all rows on this request's connection via a cached prepared statement"""
+    return db.fetch_all_prepared(query, params, conn=get_db())
+
+
+def iter_all(query: str, params=None):
+    """Stream rows on this request's connection through a server-side cursor"""
+    return db.iter_all(query, params, conn=get_db())
+
+
+# Patterns used by format_eligibility_text, compiled once at import
+CAMEL_CASE_RE = re.compile(r'[A-Z][a-z]+[A-Z][a-z]+')
+CAMEL_BOUNDARY_RE = re.compile(r'([a-z\)])([A-Z])')
+WHO_ELIGIBLE_RE = re.compile(r'^.*?(?:Who Is Eligible|Eligible applicants)', re.I)
+
+
+@lru_cache(maxsize=4096)
+def format_eligibility_text(eligibility_raw: str) -> Mapping:
     """
     Format raw eligibility text into structured, readable sections
 
+    Results are cached per input string, so they are returned read-only
+    (a mapping proxy with tuple values) to keep callers from mutating shared copies.
+
     Returns:
-        dict with 'intro', 'commodities', 'requirements', and 'formatted_html'
+        mapping with 'intro', 'commodities', 'requirements', and 'formatted_html'
     """
     if not eligibility_raw:
-        return {'intro': None, 'commodities': [], 'requirements': [], 'formatted_html': None}
+        return MappingProxyType({'intro': None, 'commodities': (), 'requirements': (), 'formatted_html': None})
 
     # Split by pipe separator and remove duplicates
     sections = eligibility_raw.split('|')
@@ -58,7 +179,7 @@ def format_eligibility_text(eligibility_raw: str) -> dict:
 
     for section in unique_sections:
         # Check if this is a commodity list (contains multiple capital words stuck together)
-        if 'include:' in section.lower() and re.search(r'[A-Z][a-z]+[A-Z][a-z]+', section):
+        if 'include:' in section.lower() and CAMEL_CASE_RE.search(section):
             # Extract the list part
             parts = section.split('include:', 1)
             if len(parts) == 2:
@@ -68,7 +189,7 @@ def format_eligibility_text(eligibility_raw: str) -> dict:
                 # Split camelCase/PascalCase commodities
                 # Handle multi-word items like "Dry peas", "Grain sorghum", etc.
                 # First, add markers before capital letters (but not after spaces or opening parens)
-                spaced = re.sub(r'([a-z\)])([A-Z])', r'\1||\2', commodity_text)
+                spaced = CAMEL_BOUNDARY_RE.sub(r'\1||\2', commodity_text)
                 # Split on the marker and clean up
                 items = [item.strip() for item in spaced.split('||') if item.strip()]
                 commodities = items
@@ -76,7 +197,7 @@ def format_eligibility_text(eligibility_raw: str) -> dict:
         # Check if this is a "Who Is Eligible" section
         elif 'who is eligible' in section.lower() or 'eligible applicants' in section.lower():
             # Extract just the requirements part
-            text = re.sub(r'^.*?(?:Who Is Eligible|Eligible applicants)', '', section, flags=re.I).strip()
+            text = WHO_ELIGIBLE_RE.sub('', section).strip()
             if text and text not in requirements:
                 requirements.append(text)
 
@@ -88,66 +209,153 @@ def format_eligibility_text(eligibility_raw: str) -> dict:
             else:
                 intro = section
 
-    return {
+    return MappingProxyType({
         'intro': intro,
-        'commodities': commodities,
-        'requirements': requirements
-    }
+        'commodities': tuple(commodities),
+        'requirements': tuple(requirements)
+    })
 
 
 # Register the filter for use in templates
 app.jinja_env.filters['format_eligibility'] = format_eligibility_text
 
 
+# Aggregate pages are cached per data version; the TTL bounds staleness from
+# writes that don't touch last_updated (e.g. content_type recategorization)
+AGGREGATE_CACHE_TTL_SECONDS = 60
+
+# How long the data version is reused, and how long clients may reuse a page without revalidating
+DATA_VERSION_TTL_SECONDS = 5
+CONDITIONAL_MAX_AGE_SECONDS = 60
+
+
+@cached(TTLCache(maxsize=1, ttl=DATA_VERSION_TTL_SECONDS), lock=threading.Lock())
+def get_data_version():
+    """Stamp that changes whenever program rows are inserted or re-scraped"""
+    return fetch_one("SELECT MAX(last_updated) as version FROM programs")['version']
+
+
+def _validator_window():
+    """
+    Start of the current AGGREGATE_CACHE_TTL_SECONDS window (UTC)
+
+    last_updated misses some writes (see AGGREGATE_CACHE_TTL_SECONDS), so page validators
+    also roll over once per window rather than answering 304 on a stale page forever.
+    """
+    now = int(time.time())
+    return datetime.fromtimestamp(now - now % AGGREGATE_CACHE_TTL_SECONDS, timezone.utc)
+
+
+def _set_cache_validators(response, etag, last_modified):
+    """Attach ETag / Last-Modified / Cache-Control to a response"""
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = CONDITIONAL_MAX_AGE_SECONDS
+    return response
+
+
+def conditional_response(render):
+    """
+    Serve a page that only depends on program data, honoring conditional GETs
+
+    The ETag combines the data version and validator window with the request path and
+    query string. A matching If-None-Match / If-Modified-Since gets a 304 without calling `render`.
+    """
+    version = get_data_version()
+    window = _validator_window()
+    etag = hashlib.md5(f"{version}|{window.timestamp()}|{request.full_path}".encode()).hexdigest()
+
+    last_modified = window
+    if version:
+        if version.tzinfo is None:
+            version = version.replace(tzinfo=timezone.utc)
+        last_modified = max(version, window)
+
+    not_modified = _set_cache_validators(app.response_class(), etag, last_modified).make_conditional(request)
+    if not_modified.status_code == 304:
+        return not_modified
+
+    return _set_cache_validators(make_response(render()), etag, last_modified)
+
+
+@cached(TTLCache(maxsize=8, ttl=AGGREGATE_CACHE_TTL_SECONDS), lock=threading.Lock())
+def _compute_home(version):
+    """Homepage stats, categories and featured programs for a data version"""
+    # One round trip: each section is a CTE, aggregated to a JSON column
+    home = fetch_one("""
+        WITH stats AS (
+          -- Summary stats (only actual programs, not rules/reports/etc) in a single scan
+          SELECT
+            COUNT(*) as total_programs,
+            COUNT(*) FILTER (WHERE confidence_score >= 0.7) as high_quality,
+            COUNT(*) FILTER (WHERE payment_min IS NOT NULL) as with_payment_info,
+            COUNT(*) FILTER (WHERE eligibility_raw IS NOT NULL) as with_eligibility
+          FROM programs
+          WHERE content_type = 'program'
+        ),
+        categories AS (
+          -- Category breakdown (only actual programs)
+          SELECT category, COUNT(*) as count
+          FROM programs
+          WHERE content_type = 'program' AND confidence_score >= 0.5
+          GROUP BY category
+        ),
+        featured AS (
+          -- Featured high-quality programs
+          SELECT
+            id,
+            program_name,
+            SUBSTRING(description FROM 1 FOR 150) as description_short,
+            confidence_score,
+            payment_min,
+            payment_max,
+            eligibility_parsed
+          FROM programs
+          WHERE content_type = 'program' AND confidence_score >= 0.8
+            AND eligibility_parsed IS NOT NULL
+            AND payment_min IS NOT NULL
+          ORDER BY confidence_score DESC, program_name
+          LIMIT 6
+        )
+        SELECT
+          (SELECT row_to_json(stats) FROM stats) as stats,
+          COALESCE((SELECT json_agg(categories ORDER BY categories.count DESC) FROM categories), '[]') as categories,
+          COALESCE((SELECT json_agg(featured ORDER BY featured.confidence_score DESC, featured.program_name) FROM featured), '[]') as featured_programs
+    """)
+
+    stats, categories, featured_programs = home['stats'], home['categories'], home['featured_programs']
+
+    return stats, categories, featured_programs
+
+
 @app.route('/')
 def index():
     """Home page with program statistics"""
+    def render():
+        stats, categories, featured_programs = _compute_home(get_data_version())
+        return render_template('index.html', stats=stats, categories=categories, featured_programs=featured_programs)
 
-    # Get summary stats (only actual programs, not rules/reports/etc)
-    stats = {
-        'total_programs': db.fetch_one("SELECT COUNT(*) as count FROM programs WHERE content_type = 'program'")['count'],
-        'high_quality': db.fetch_one("SELECT COUNT(*) as count FROM programs WHERE content_type = 'program' AND confidence_score >= 0.7")['count'],
-        'with_payment_info': db.fetch_one("SELECT COUNT(*) as count FROM programs WHERE content_type = 'program' AND payment_min IS NOT NULL")['count'],
-        'with_eligibility': db.fetch_one("SELECT COUNT(*) as count FROM programs WHERE content_type = 'program' AND eligibility_raw IS NOT NULL")['count'],
-    }
+    return conditional_response(render)
 
-    # Get category breakdown (only actual programs)
-    categories = db.fetch_all("""
-        SELECT
-          CASE
-            WHEN program_name LIKE '%Loan%' THEN 'Loan Programs'
-            WHEN program_name LIKE '%Conservation%' OR program_name LIKE '%CRP%' THEN 'Conservation'
-            WHEN program_name LIKE '%Emergency%' OR program_name LIKE '%Disaster%' THEN 'Disaster/Emergency'
-            WHEN program_name LIKE '%Marketing%' OR program_name LIKE '%Commodity%' THEN 'Marketing/Commodity'
-            WHEN program_name LIKE '%Payment%' OR program_name LIKE '%Eligibility%' THEN 'Payment/Eligibility'
-            ELSE 'Other'
-          END as category,
-          COUNT(*) as count
-        FROM programs
-        WHERE content_type = 'program' AND confidence_score >= 0.5
-        GROUP BY category
-        ORDER BY count DESC
-    """)
 
-    # Get featured high-quality programs
-    featured_programs = db.fetch_all("""
-        SELECT
-          id,
-          program_name,
-          SUBSTRING(description FROM 1 FOR 150) as description_short,
-          confidence_score,
-          payment_min,
-          payment_max,
-          eligibility_parsed
-        FROM programs
-        WHERE content_type = 'program' AND confidence_score >= 0.8
-          AND eligibility_parsed IS NOT NULL
-          AND payment_min IS NOT NULL
-        ORDER BY confidence_score DESC, program_name
-        LIMIT 6
-    """)
+def format_payment_range(payment_min, payment_max) -> str:
+    """Format a payment range for display, e.g. $5,000 - $10,000"""
+    display = f"${payment_min:,.0f}" if payment_min else ''
+    if payment_max and payment_max != payment_min:
+        display += f" - ${payment_max:,.0f}"
+    return display
+
+
+def add_display_fields(program: dict) -> dict:
+    """Precompute a listing row's detail URL and payment text so templates just interpolate them"""
+    program['url'] = url_for('program_detail', program_id=program['id'])
+    program['payment_display'] = format_payment_range(program.get('payment_min'), program.get('payment_max'))
+    return program
 
-    return render_template('index.html', stats=stats, categories=categories, featured_programs=featured_programs)
+
+# Maximum rows on the /programs listing
+PROGRAMS_LIST_LIMIT = 100
 
 
 @app.route('/programs')
@@ -163,6 +371,7 @@ def programs():
     # Build query
     query = """
         SELECT
+          LEAST(COUNT(*) OVER (), %s) as result_count,
           id,
           program_name,
           SUBSTRING(description FROM 1 FOR 200) as description_short,
@@ -175,7 +384,7 @@ def programs():
         FROM programs
         WHERE content_type = 'program' AND confidence_score >= %s
     """
-    params = [min_confidence]
+    params = [PROGRAMS_LIST_LIMIT, min_confidence]
 
     # Add filters
     if category and category != 'all':
@@ -193,27 +402,32 @@ def programs():
         query += " AND payment_min IS NOT NULL"
 
     if search:
-        query += " AND (program_name ILIKE %s OR description ILIKE %s)"
+        query += """
+          AND (search_tsv @@ plainto_tsquery('english', %s)
+               OR program_name ILIKE %s OR description ILIKE %s)
+        """
         search_term = f'%{search}%'
-        params.extend([search_term, search_term])
+        params.extend([search, search_term, search_term])
 
-    query += " ORDER BY confidence_score DESC, program_name LIMIT 100"
+    query += " ORDER BY confidence_score DESC, program_name LIMIT %s"
+    params.append(PROGRAMS_LIST_LIMIT)
 
-    programs = db.fetch_all(query, tuple(params))
+    # Rows stream from the database into the template as the page renders
+    programs = (add_display_fields(program) for program in iter_all(query, tuple(params)))
 
-    return render_template('programs.html',
-                         programs=programs,
-                         category=category,
-                         min_confidence=min_confidence,
-                         has_payment=has_payment,
-                         search=search)
+    return conditional_response(lambda: stream_template('programs.html',
+                                                       programs=programs,
+                                                       category=category,
+                                                       min_confidence=min_confidence,
+                                                       has_payment=has_payment,
+                                                       search=search))
 
 
 @app.route('/program/<int:program_id>')
 def program_detail(program_id):
     """Program detail page"""
 
-    program = db.fetch_one("""
+    program = fetch_one("""
         SELECT *
         FROM programs
         WHERE content_type = 'program' AND id = %s
@@ -225,30 +439,23 @@ def program_detail(program_id):
     return render_template('program_detail.html', program=program)
 
 
-@app.route('/api/stats')
-def api_stats():
-    """API endpoint for statistics"""
-
-    # Category distribution
-    categories = db.fetch_all("""
+@cached(TTLCache(maxsize=8, ttl=AGGREGATE_CACHE_TTL_SECONDS), lock=threading.Lock())
+def _compute_stats(version):
+    """Category and confidence distributions for a data version"""
+    # Category distribution (this breakdown has no Payment/Eligibility bucket)
+    categories = fetch_all("""
         SELECT
-          CASE
-            WHEN program_name LIKE '%Loan%' THEN 'Loan Programs'
-            WHEN program_name LIKE '%Conservation%' OR program_name LIKE '%CRP%' THEN 'Conservation'
-            WHEN program_name LIKE '%Emergency%' OR program_name LIKE '%Disaster%' THEN 'Disaster/Emergency'
-            WHEN program_name LIKE '%Marketing%' OR program_name LIKE '%Commodity%' THEN 'Marketing/Commodity'
-            ELSE 'Other'
-          END as category,
+          CASE WHEN category = 'Payment/Eligibility' THEN 'Other' ELSE category END as category,
           COUNT(*) as count,
           AVG(confidence_score) as avg_confidence
         FROM programs
         WHERE content_type = 'program' AND confidence_score >= 0.5
-        GROUP BY category
+        GROUP BY 1
         ORDER BY count DESC
     """)
 
     # Confidence distribution
-    confidence_dist = db.fetch_all("""
+    confidence_dist = fetch_all("""
         SELECT
           CASE
             WHEN confidence_score >= 0.9 THEN '0.9-1.0'
@@ -262,10 +469,16 @@ def api_stats():
         ORDER BY MIN(confidence_score) DESC
     """)
 
-    return jsonify({
+    return {
         'categories': categories,
         'confidence_distribution': confidence_dist
-    })
+    }
+
+
+@app.route('/api/stats')
+def api_stats():
+    """API endpoint for statistics"""
+    return conditional_response(lambda: jsonify(_compute_stats(get_data_version())))
 
 
 @app.route('/search')
@@ -276,160 +489,319 @@ def search():
     if not query:
         return jsonify([])
 
-    results = db.fetch_all("""
+    results = fetch_all("""
         SELECT
           id,
           program_name,
           SUBSTRING(description FROM 1 FOR 150) as description_short,
           confidence_score
-        FROM programs
-        WHERE content_type = 'program' AND program_name ILIKE %s
-           OR description ILIKE %s
-        ORDER BY confidence_score DESC
+        FROM programs, plainto_tsquery('english', %s) as search_query
+        WHERE content_type = 'program'
+          AND (search_tsv @@ search_query OR program_name ILIKE %s OR description ILIKE %s)
+        ORDER BY ts_rank(search_tsv, search_query) DESC, confidence_score DESC
         LIMIT 20
-    """, (f'%{query}%', f'%{query}%'))
+    """, (query, f'%{query}%', f'%{query}%'))
 
     return jsonify(results)
 
 
+# Program Finder matchers: (selection key, eligibility flags, "Why This Matches" message).
+# A selection matches when any of its flags is true; the message is shown when the
+# first (specific) flag is true.
+GENERIC_CROP = 'generic_crop'  # pseudo-flag: crop_farming program that names no specific crop
+
+FARM_TYPE_MATCHERS = (
+    # Livestock types - match specific OR generic livestock
+    ('beef_cattle', ('livestock_beef_cattle', 'livestock'), 'Supports beef cattle operations'),
+    ('dairy_cattle', ('livestock_dairy_cattle', 'dairy', 'livestock'), 'Designed for dairy operations'),
+    ('hogs', ('livestock_hogs', 'livestock'), 'Available for hog producers'),
+    ('poultry', ('livestock_poultry', 'livestock'), 'Serves poultry farms'),
+    ('sheep_goats', ('livestock_sheep_goats', 'livestock'), 'Open to sheep and goat operations'),
+    ('bees', ('livestock_bees', 'livestock'), 'Supports beekeepers and honey producers'),
+    ('aquaculture', ('livestock_aquaculture', 'livestock'), 'Available for aquaculture operations'),
+
+    # Crop types - match specific OR truly generic crop programs
+    ('wheat', ('crop_wheat', GENERIC_CROP), 'Covers wheat production'),
+    ('corn', ('crop_corn', GENERIC_CROP), 'Includes corn crops'),
+    ('soybeans', ('crop_soybeans', GENERIC_CROP), 'Applies to soybean farmers'),
+    ('cotton', ('crop_cotton', GENERIC_CROP), 'Available for cotton growers'),
+    ('rice', ('crop_rice', GENERIC_CROP), 'Covers rice production'),
+    ('barley', ('crop_barley', GENERIC_CROP), 'Includes barley crops'),
+    ('sorghum', ('crop_sorghum', GENERIC_CROP), 'Applies to sorghum/milo farmers'),
+    ('peanuts', ('crop_peanuts', GENERIC_CROP), 'Available for peanut growers'),
+    ('sunflower', ('crop_sunflower', GENERIC_CROP), 'Covers sunflower production'),
+    ('canola', ('crop_canola', GENERIC_CROP), 'Includes canola/rapeseed'),
+
+    # Specialty crops
+    ('fruits', ('specialty_crop_fruits', 'specialty_crops'), 'Supports fruit growers'),
+    ('vegetables', ('specialty_crop_vegetables', 'specialty_crops'), 'Available for vegetable farmers'),
+    ('nuts', ('specialty_crop_nuts', 'specialty_crops'), 'Covers nut tree operations'),
+
+    # Other types
+    ('hay_forage', ('forage_hay',), 'Includes hay and forage producers'),
+    ('organic', ('organic',), 'Available for organic farmers'),
+)
+
+PROGRAM_TYPE_MATCHERS = (
+    ('loans', ('is_loan',), 'Provides loan financing'),
+    ('payments', ('is_payment',), 'Offers direct payments'),
+    ('insurance', ('is_insurance',), 'Risk management/insurance program'),
+    ('conservation', ('is_conservation',), 'Conservation-focused program'),
+)
+
+# Farmer status and situation are bonus matchers: they boost ranking but never filter
+FARMER_STATUS_MATCHERS = (
+    ('beginning', ('beginning_farmer',), 'Prioritizes beginning farmers'),
+    ('young', ('young_farmer',), 'Supports young farmers'),
+    ('veteran', ('veteran',), 'Serves veteran farmers'),
+)
+
+SITUATION_MATCHERS = (
+    ('disaster', ('is_disaster',), 'Provides disaster assistance'),
+    ('price_loss', ('for_price_loss',), 'Helps with price/market losses'),
+    ('need_equipment', ('for_equipment',), 'Can fund equipment purchases'),
+    ('buy_land', ('for_land_purchase',), 'Helps with land acquisition'),
+)
+
+SPECIFIC_CROP_KEYS = frozenset(
+    flags[0] for _, flags, _ in FARM_TYPE_MATCHERS if GENERIC_CROP in flags
+)
+
+# Flags are matched with jsonb containment (@>) so the GIN index on eligibility_parsed
+# can answer them (see add_webapp_indexes.py)
+def _contains_flag(flag):
+    """jsonb containment document matching rows where the flag is true"""
+    return json_dumps({flag: True})
+
+
+GENERIC_CROP_SQL = (
+    f"(eligibility_parsed @> '{_contains_flag('crop_farming')}' AND "
+    + " AND ".join(
+        f"NOT eligibility_parsed @> '{_contains_flag(flag)}'"
+        for flag in sorted(SPECIFIC_CROP_KEYS)  # stable SQL text across processes
+    )
+    + ")"
+)
+
+
+def _any_flag_sql(flags, params):
+    """SQL condition for "any of these eligibility flags is true"; flag documents are bound as params"""
+    conditions = []
+    for flag in flags:
+        if flag == GENERIC_CROP:
+            conditions.append(GENERIC_CROP_SQL)
+        else:
+            conditions.append("eligibility_parsed @> %s::jsonb")
+            params.append(_contains_flag(flag))
+    return f"({' OR '.join(conditions)})"
+
+
+def _score_term(flags, params):
+    """SQL 1/0 term for one matcher: 1 when any of its flags is true"""
+    return f"CASE WHEN {_any_flag_sql(flags, params)} THEN 1 ELSE 0 END"
+
+
+def _selected(matchers, selected_keys):
+    """Matchers whose key the farmer selected, in table order"""
+    return [matcher for matcher in matchers if matcher[0] in selected_keys]
+
+
+def _first(value):
+    """First value of a repeated query parameter (like MultiDict.get)"""
+    return value[0] if isinstance(value, list) else value
+
+
+def _optional(cast):
+    """Coerce the first query value with `cast`, or None if missing/invalid (like MultiDict.get(type=...))"""
+    def parse(value):
+        value = _first(value)
+        try:
+            return cast(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+    return BeforeValidator(parse)
+
+
+OptionalInt = Annotated[Optional[int], _optional(int)]
+OptionalFloat = Annotated[Optional[float], _optional(float)]
+OptionalStr = Annotated[Optional[str], BeforeValidator(_first)]
+
+
+class FinderQuery(BaseModel):
+    """Program Finder query string, parsed in one pass"""
+
+    model_config = ConfigDict(extra='ignore')
+
+    # Matching selections
+    farm_type: List[str] = Field(default_factory=list)
+    farmer_status: List[str] = Field(default_factory=list)
+    program_type: List[str] = Field(default_factory=list)
+    situation: List[str] = Field(default_factory=list)
+
+    # Farm profile (checked against each program's eligibility requirements)
+    total_acres: OptionalInt = None
+    gross_revenue: OptionalFloat = None
+    has_conservation_plan: OptionalStr = Field(default=None, alias='conservation_plan')
+    credit_status: OptionalStr = None
+    is_us_citizen: OptionalStr = None
+    can_get_commercial_credit: OptionalStr = Field(default=None, alias='commercial_credit')
+    owns_farm: OptionalStr = None
+
+    def farm_profile(self) -> dict:
+        """Farm profile inputs keyed as the template and requirement checks expect"""
+        return self.model_dump(exclude={'farm_type', 'farmer_status', 'program_type', 'situation'})
+
+
+# Form answer -> requirement status (anything else, including no answer, is 'unknown')
+YES_NO_STATUS = {'yes': 'met', 'no': 'not_met'}
+NO_YES_STATUS = {'no': 'met', 'yes': 'not_met'}  # requirements phrased in the negative
+CREDIT_STATUS = {'good': 'met', 'poor': 'not_met'}
+
+
+# Eligibility requirement checks: requirement key -> fn(farm_profile, farmer_status_keys) -> status
+def _requirement_unknown(farm_profile, farmer_status_keys):
+    return 'unknown'
+
+
+def _check_us_citizen(farm_profile, farmer_status_keys):
+    return YES_NO_STATUS.get(farm_profile['is_us_citizen'], 'unknown')
+
+
+def _check_conservation_plan(farm_profile, farmer_status_keys):
+    return YES_NO_STATUS.get(farm_profile['has_conservation_plan'], 'unknown')
+
+
+def _check_satisfactory_credit(farm_profile, farmer_status_keys):
+    return CREDIT_STATUS.get(farm_profile['credit_status'], 'unknown')
+
+
+def _check_no_commercial_credit(farm_profile, farmer_status_keys):
+    return NO_YES_STATUS.get(farm_profile['can_get_commercial_credit'], 'unknown')
+
+
+def _check_beginning_farmer(farm_profile, farmer_status_keys):
+    return 'met' if 'beginning' in farmer_status_keys else 'unknown'
+
+
+def _check_veteran(farm_profile, farmer_status_keys):
+    return 'met' if 'veteran' in farmer_status_keys else 'unknown'
+
+
+def _check_agi_limit(farm_profile, farmer_status_keys):
+    gross_revenue = farm_profile['gross_revenue']
+    if not gross_revenue:
+        return 'unknown'
+    # Typical AGI limit is $900,000
+    return 'met' if gross_revenue < 900000 else 'not_met'
+
+
+def _check_farm_owner(farm_profile, farmer_status_keys):
+    return YES_NO_STATUS.get(farm_profile['owns_farm'], 'unknown')
+
+
+def _check_operates_farm(farm_profile, farmer_status_keys):
+    # Assume they operate if they're using the finder
+    return 'met'
+
+
+REQUIREMENT_CHECKS = {
+    'is_us_citizen': _check_us_citizen,
+    'has_conservation_plan': _check_conservation_plan,
+    'has_satisfactory_credit': _check_satisfactory_credit,
+    'cannot_get_commercial_credit': _check_no_commercial_credit,
+    'is_beginning_farmer': _check_beginning_farmer,
+    'is_veteran': _check_veteran,
+    # We don't collect this in the form yet, so it's always unknown
+    'is_socially_disadvantaged': _requirement_unknown,
+    'meets_agi_limit': _check_agi_limit,
+    'is_farm_owner': _check_farm_owner,
+    'owns_and_operates_farm': _check_farm_owner,
+    'operates_farm': _check_operates_farm,
+}
+
+
+# Programs shown by the finder. Only these rows leave the database: ORDER BY ... LIMIT
+# lets Postgres keep a bounded top-N heap instead of sorting every candidate.
+FINDER_TOP_N = 50
+
+# Rendered finder pages kept per process (keyed by data version + canonical inputs).
+# Like the aggregate caches, entries expire so writes that skip last_updated show up.
+FINDER_CACHE_SIZE = 256
+
+
 @app.route('/finder')
 def finder():
     """Program Finder - Match programs to farmer's situation"""
 
-    # Get farmer's inputs from query params
-    farm_type = request.args.getlist('farm_type')
-    farmer_status = request.args.getlist('farmer_status')
-    program_type = request.args.getlist('program_type')
-    situation = request.args.getlist('situation')
-
-    # Get farm profile inputs
-    farm_profile = {
-        'total_acres': request.args.get('total_acres', type=int),
-        'gross_revenue': request.args.get('gross_revenue', type=float),
-        'has_conservation_plan': request.args.get('conservation_plan'),
-        'credit_status': request.args.get('credit_status'),
-        'is_us_citizen': request.args.get('is_us_citizen'),
-        'can_get_commercial_credit': request.args.get('commercial_credit'),
-        'owns_farm': request.args.get('owns_farm'),
-    }
+    # Get farmer's inputs and farm profile from query params
+    finder_query = FinderQuery.model_validate(request.args.to_dict(flat=False))
+
+    # Selection order doesn't change the page, so sorted tuples make a canonical cache key
+    return _render_finder(
+        get_data_version(),
+        tuple(sorted(finder_query.farm_type)),
+        tuple(sorted(finder_query.farmer_status)),
+        tuple(sorted(finder_query.program_type)),
+        tuple(sorted(finder_query.situation)),
+        tuple(sorted(finder_query.farm_profile().items())),
+    )
+
+
+@cached(TTLCache(maxsize=FINDER_CACHE_SIZE, ttl=AGGREGATE_CACHE_TTL_SECONDS), lock=threading.Lock())
+def _render_finder(version, farm_type, farmer_status, program_type, situation, farm_profile_items):
+    """Render the Program Finder page for a data version and canonical inputs"""
+    farm_type = list(farm_type)
+    farmer_status = list(farmer_status)
+    program_type = list(program_type)
+    situation = list(situation)
+    farm_profile = dict(farm_profile_items)
 
     # Build matching criteria if form submitted
     matched_programs = []
     if any([farm_type, farmer_status, program_type, situation]):
-        # Build WHERE clause for matching (use OR within categories, AND between categories)
-        conditions = ["content_type = 'program'", "confidence_score >= 0.5", "eligibility_parsed IS NOT NULL"]
-
-        # Farm Type matching (OR within this category)
-        farm_type_conditions = []
-
-        # Helper: check if program has NO specific crop flags (truly generic crop program)
-        no_specific_crops = (
-            "NOT COALESCE((eligibility_parsed->>'crop_wheat')::boolean, false) AND "
-            "NOT COALESCE((eligibility_parsed->>'crop_corn')::boolean, false) AND "
-            "NOT COALESCE((eligibility_parsed->>'crop_soybeans')::boolean, false) AND "
-            "NOT COALESCE((eligibility_parsed->>'crop_cotton')::boolean, false) AND "
-            "NOT COALESCE((eligibility_parsed->>'crop_rice')::boolean, false) AND "
-            "NOT COALESCE((eligibility_parsed->>'crop_barley')::boolean, false) AND "
-            "NOT COALESCE((eligibility_parsed->>'crop_sorghum')::boolean, false) AND "
-            "NOT COALESCE((eligibility_parsed->>'crop_peanuts')::boolean, false) AND "
-            "NOT COALESCE((eligibility_parsed->>'crop_sunflower')::boolean, false) AND "
-            "NOT COALESCE((eligibility_parsed->>'crop_canola')::boolean, false)"
+        # Selections as sets once, so every membership test below is O(1)
+        farmer_status_keys = frozenset(farmer_status)
+
+        farm_type_matchers = _selected(FARM_TYPE_MATCHERS, frozenset(farm_type))
+        program_type_matchers = _selected(PROGRAM_TYPE_MATCHERS, frozenset(program_type))
+        bonus_matchers = (
+            _selected(FARMER_STATUS_MATCHERS, farmer_status_keys)
+            + _selected(SITUATION_MATCHERS, frozenset(situation))
         )
 
-        # Livestock types - match specific OR generic livestock
-        if 'beef_cattle' in farm_type:
-            farm_type_conditions.append("((eligibility_parsed->>'livestock_beef_cattle')::boolean = true OR ((eligibility_parsed->>'livestock')::boolean = true))")
-        if 'dairy_cattle' in farm_type:
-            farm_type_conditions.append("((eligibility_parsed->>'livestock_dairy_cattle')::boolean = true OR (eligibility_parsed->>'dairy')::boolean = true OR ((eligibility_parsed->>'livestock')::boolean = true))")
-        if 'hogs' in farm_type:
-            farm_type_conditions.append("((eligibility_parsed->>'livestock_hogs')::boolean = true OR ((eligibility_parsed->>'livestock')::boolean = true))")
-        if 'poultry' in farm_type:
-            farm_type_conditions.append("((eligibility_parsed->>'livestock_poultry')::boolean = true OR ((eligibility_parsed->>'livestock')::boolean = true))")
-        if 'sheep_goats' in farm_type:
-            farm_type_conditions.append("((eligibility_parsed->>'livestock_sheep_goats')::boolean = true OR ((eligibility_parsed->>'livestock')::boolean = true))")
-        if 'bees' in farm_type:
-            farm_type_conditions.append("((eligibility_parsed->>'livestock_bees')::boolean = true OR ((eligibility_parsed->>'livestock')::boolean = true))")
-        if 'aquaculture' in farm_type:
-            farm_type_conditions.append("((eligibility_parsed->>'livestock_aquaculture')::boolean = true OR ((eligibility_parsed->>'livestock')::boolean = true))")
-
-        # Crop types - match specific OR truly generic (crop_farming with NO specific crops)
-        if 'wheat' in farm_type:
-            farm_type_conditions.append(f"((eligibility_parsed->>'crop_wheat')::boolean = true OR ((eligibility_parsed->>'crop_farming')::boolean = true AND {no_specific_crops}))")
-        if 'corn' in farm_type:
-            farm_type_conditions.append(f"((eligibility_parsed->>'crop_corn')::boolean = true OR ((eligibility_parsed->>'crop_farming')::boolean = true AND {no_specific_crops}))")
-        if 'soybeans' in farm_type:
-            farm_type_conditions.append(f"((eligibility_parsed->>'crop_soybeans')::boolean = true OR ((eligibility_parsed->>'crop_farming')::boolean = true AND {no_specific_crops}))")
-        if 'cotton' in farm_type:
-            farm_type_conditions.append(f"((eligibility_parsed->>'crop_cotton')::boolean = true OR ((eligibility_parsed->>'crop_farming')::boolean = true AND {no_specific_crops}))")
-        if 'rice' in farm_type:
-            farm_type_conditions.append(f"((eligibility_parsed->>'crop_rice')::boolean = true OR ((eligibility_parsed->>'crop_farming')::boolean = true AND {no_specific_crops}))")
-        if 'barley' in farm_type:
-            farm_type_conditions.append(f"((eligibility_parsed->>'crop_barley')::boolean = true OR ((eligibility_parsed->>'crop_farming')::boolean = true AND {no_specific_crops}))")
-        if 'sorghum' in farm_type:
-            farm_type_conditions.append(f"((eligibility_parsed->>'crop_sorghum')::boolean = true OR ((eligibility_parsed->>'crop_farming')::boolean = true AND {no_specific_crops}))")
-        if 'peanuts' in farm_type:
-            farm_type_conditions.append(f"((eligibility_parsed->>'crop_peanuts')::boolean = true OR ((eligibility_parsed->>'crop_farming')::boolean = true AND {no_specific_crops}))")
-        if 'sunflower' in farm_type:
-            farm_type_conditions.append(f"((eligibility_parsed->>'crop_sunflower')::boolean = true OR ((eligibility_parsed->>'crop_farming')::boolean = true AND {no_specific_crops}))")
-        if 'canola' in farm_type:
-            farm_type_conditions.append(f"((eligibility_parsed->>'crop_canola')::boolean = true OR ((eligibility_parsed->>'crop_farming')::boolean = true AND {no_specific_crops}))")
-
-        # Specialty crops
-        if 'fruits' in farm_type:
-            farm_type_conditions.append("((eligibility_parsed->>'specialty_crop_fruits')::boolean = true OR (eligibility_parsed->>'specialty_crops')::boolean = true)")
-        if 'vegetables' in farm_type:
-            farm_type_conditions.append("((eligibility_parsed->>'specialty_crop_vegetables')::boolean = true OR (eligibility_parsed->>'specialty_crops')::boolean = true)")
-        if 'nuts' in farm_type:
-            farm_type_conditions.append("((eligibility_parsed->>'specialty_crop_nuts')::boolean = true OR (eligibility_parsed->>'specialty_crops')::boolean = true)")
-
-        # Other types
-        if 'hay_forage' in farm_type:
-            farm_type_conditions.append("(eligibility_parsed->>'forage_hay')::boolean = true")
-        if 'organic' in farm_type:
-            farm_type_conditions.append("(eligibility_parsed->>'organic')::boolean = true")
-
-        if farm_type_conditions:
-            conditions.append("(" + " OR ".join(farm_type_conditions) + ")")
-
-        # Farmer Status matching (OPTIONAL - used for ranking, not filtering)
-        # Most programs don't explicitly mention farmer status in eligibility
-        # So we don't filter by this - instead we'll boost ranking later
-        farmer_status_conditions = []
-        if 'beginning' in farmer_status:
-            farmer_status_conditions.append("(eligibility_parsed->>'beginning_farmer')::boolean = true")
-        if 'young' in farmer_status:
-            farmer_status_conditions.append("(eligibility_parsed->>'young_farmer')::boolean = true")
-        if 'veteran' in farmer_status:
-            farmer_status_conditions.append("(eligibility_parsed->>'veteran')::boolean = true")
-        # NOTE: Not adding to conditions - farmer status is informational only
-
-        # Program Type matching (OR within this category)
-        program_type_conditions = []
-        if 'loans' in program_type:
-            program_type_conditions.append("(eligibility_parsed->>'is_loan')::boolean = true")
-        if 'payments' in program_type:
-            program_type_conditions.append("(eligibility_parsed->>'is_payment')::boolean = true")
-        if 'insurance' in program_type:
-            program_type_conditions.append("(eligibility_parsed->>'is_insurance')::boolean = true")
-        if 'conservation' in program_type:
-            program_type_conditions.append("(eligibility_parsed->>'is_conservation')::boolean = true")
-        if program_type_conditions:
-            conditions.append("(" + " OR ".join(program_type_conditions) + ")")
-
-        # Situation matching (OPTIONAL - used for ranking, not filtering)
-        # Many general programs can help with these situations even if not specifically designed for them
-        situation_conditions = []
-        if 'disaster' in situation:
-            situation_conditions.append("(eligibility_parsed->>'is_disaster')::boolean = true")
-        if 'price_loss' in situation:
-            situation_conditions.append("(eligibility_parsed->>'for_price_loss')::boolean = true")
-        if 'need_equipment' in situation:
-            situation_conditions.append("(eligibility_parsed->>'for_equipment')::boolean = true")
-        if 'buy_land' in situation:
-            situation_conditions.append("(eligibility_parsed->>'for_land_purchase')::boolean = true")
-        # NOTE: Not adding to conditions - situation is informational only
-
-        # Execute query (AND between categories)
+        # Build WHERE clause for matching (use OR within categories, AND between categories)
+        conditions = ["content_type = 'program'", "confidence_score >= 0.5", "eligibility_parsed IS NOT NULL"]
+        where_params = []
+        for matchers in (farm_type_matchers, program_type_matchers):
+            if matchers:
+                conditions.append(
+                    "(" + " OR ".join(_any_flag_sql(flags, where_params) for _, flags, _ in matchers) + ")"
+                )
+
+        # Score every candidate in SQL: one 1/0 term per selected criterion
+        required_params = []
+        required_terms = [
+            _score_term(flags, required_params)
+            for _, flags, _ in farm_type_matchers + program_type_matchers
+        ]
+
+        # Farmer status and situation matches count toward the score and add +5 bonus points each
+        bonus_params = []
+        bonus_terms = [_score_term(flags, bonus_params) for _, flags, _ in bonus_matchers]
+
+        match_count_sql = " + ".join(required_terms + bonus_terms) or "0"
+        bonus_sql = " + ".join(bonus_terms) or "0"
+
+        # Don't count farmer_status or situation in total since they're optional
+        total_criteria = len(farm_type) + len(program_type)
+        if total_criteria > 0:
+            base_score_sql = f"ROUND(({match_count_sql})::float8 / %s * 100)"
+            base_score_params = required_params + bonus_params + [total_criteria]
+        else:
+            base_score_sql = "0"
+            base_score_params = []
+
+        # Execute query (AND between categories), best matches first
         where_clause = " AND ".join(conditions)
         query = f"""
             SELECT
@@ -443,266 +815,69 @@ def finder():
               source_url,
               eligibility_parsed,
               ai_summary,
-              eligibility_requirements
+              eligibility_requirements->'requirements' as requirements,
+              LEAST(100, {base_score_sql} + 5 * ({bonus_sql}))::int as match_score,
+              ({bonus_sql}) > 0 as has_bonus_match
             FROM programs
             WHERE {where_clause}
-            ORDER BY confidence_score DESC, program_name
-            LIMIT 50
+            ORDER BY match_score DESC, confidence_score DESC, program_name
+            LIMIT %s
         """
-
-        matched_programs = db.fetch_all(query)
-
-        # Calculate match scores for each program
-        for program in matched_programs:
-            criteria = program.get('eligibility_parsed', {})
-            match_count = 0
-            # Don't count farmer_status or situation in total since they're optional
-            total_criteria = len(farm_type) + len(program_type)
-            # But we'll add bonus points for farmer status and situation matches
-
-            # Count how many selected criteria match
-            # Livestock types
-            if 'beef_cattle' in farm_type and (criteria.get('livestock_beef_cattle') or criteria.get('livestock')):
-                match_count += 1
-            if 'dairy_cattle' in farm_type and (criteria.get('livestock_dairy_cattle') or criteria.get('dairy') or criteria.get('livestock')):
-                match_count += 1
-            if 'hogs' in farm_type and (criteria.get('livestock_hogs') or criteria.get('livestock')):
-                match_count += 1
-            if 'poultry' in farm_type and (criteria.get('livestock_poultry') or criteria.get('livestock')):
-                match_count += 1
-            if 'sheep_goats' in farm_type and (criteria.get('livestock_sheep_goats') or criteria.get('livestock')):
-                match_count += 1
-            if 'bees' in farm_type and (criteria.get('livestock_bees') or criteria.get('livestock')):
-                match_count += 1
-            if 'aquaculture' in farm_type and (criteria.get('livestock_aquaculture') or criteria.get('livestock')):
-                match_count += 1
-
-            # Crop types - only match generic if NO specific crops are set
-            has_no_specific_crops = not any([
-                criteria.get('crop_wheat'), criteria.get('crop_corn'), criteria.get('crop_soybeans'),
-                criteria.get('crop_cotton'), criteria.get('crop_rice'), criteria.get('crop_barley'),
-                criteria.get('crop_sorghum'), criteria.get('crop_peanuts'), criteria.get('crop_sunflower'),
-                criteria.get('crop_canola')
-            ])
-
-            if 'wheat' in farm_type and (criteria.get('crop_wheat') or (criteria.get('crop_farming') and has_no_specific_crops)):
-                match_count += 1
-            if 'corn' in farm_type and (criteria.get('crop_corn') or (criteria.get('crop_farming') and has_no_specific_crops)):
-                match_count += 1
-            if 'soybeans' in farm_type and (criteria.get('crop_soybeans') or (criteria.get('crop_farming') and has_no_specific_crops)):
-                match_count += 1
-            if 'cotton' in farm_type and (criteria.get('crop_cotton') or (criteria.get('crop_farming') and has_no_specific_crops)):
-                match_count += 1
-            if 'rice' in farm_type and (criteria.get('crop_rice') or (criteria.get('crop_farming') and has_no_specific_crops)):
-                match_count += 1
-            if 'barley' in farm_type and (criteria.get('crop_barley') or (criteria.get('crop_farming') and has_no_specific_crops)):
-                match_count += 1
-            if 'sorghum' in farm_type and (criteria.get('crop_sorghum') or (criteria.get('crop_farming') and has_no_specific_crops)):
-                match_count += 1
-            if 'peanuts' in farm_type and (criteria.get('crop_peanuts') or (criteria.get('crop_farming') and has_no_specific_crops)):
-                match_count += 1
-            if 'sunflower' in farm_type and (criteria.get('crop_sunflower') or (criteria.get('crop_farming') and has_no_specific_crops)):
-                match_count += 1
-            if 'canola' in farm_type and (criteria.get('crop_canola') or (criteria.get('crop_farming') and has_no_specific_crops)):
-                match_count += 1
-
-            # Specialty crops
-            if 'fruits' in farm_type and (criteria.get('specialty_crop_fruits') or criteria.get('specialty_crops')):
-                match_count += 1
-            if 'vegetables' in farm_type and (criteria.get('specialty_crop_vegetables') or criteria.get('specialty_crops')):
-                match_count += 1
-            if 'nuts' in farm_type and (criteria.get('specialty_crop_nuts') or criteria.get('specialty_crops')):
-                match_count += 1
-
-            # Other types
-            if 'hay_forage' in farm_type and criteria.get('forage_hay'):
-                match_count += 1
-            if 'organic' in farm_type and criteria.get('organic'):
-                match_count += 1
-            if 'beginning' in farmer_status and criteria.get('beginning_farmer'):
-                match_count += 1
-            if 'young' in farmer_status and criteria.get('young_farmer'):
-                match_count += 1
-            if 'veteran' in farmer_status and criteria.get('veteran'):
-                match_count += 1
-            if 'loans' in program_type and criteria.get('is_loan'):
-                match_count += 1
-            if 'payments' in program_type and criteria.get('is_payment'):
-                match_count += 1
-            if 'insurance' in program_type and criteria.get('is_insurance'):
-                match_count += 1
-            if 'conservation' in program_type and criteria.get('is_conservation'):
-                match_count += 1
-            if 'disaster' in situation and criteria.get('is_disaster'):
-                match_count += 1
-            if 'price_loss' in situation and criteria.get('for_price_loss'):
-                match_count += 1
-            if 'need_equipment' in situation and criteria.get('for_equipment'):
-                match_count += 1
-            if 'buy_land' in situation and criteria.get('for_land_purchase'):
-                match_count += 1
-
-            # Calculate base match score from required criteria
-            base_score = round((match_count / total_criteria * 100) if total_criteria > 0 else 0)
-
-            # Add bonus points for farmer status and situation matches (up to +25%)
-            bonus_points = 0
-            if 'beginning' in farmer_status and criteria.get('beginning_farmer'):
-                bonus_points += 5
-            if 'young' in farmer_status and criteria.get('young_farmer'):
-                bonus_points += 5
-            if 'veteran' in farmer_status and criteria.get('veteran'):
-                bonus_points += 5
-            if 'disaster' in situation and criteria.get('is_disaster'):
-                bonus_points += 5
-            if 'price_loss' in situation and criteria.get('for_price_loss'):
-                bonus_points += 5
-            if 'need_equipment' in situation and criteria.get('for_equipment'):
-                bonus_points += 5
-            if 'buy_land' in situation and criteria.get('for_land_purchase'):
-                bonus_points += 5
-
-            program['match_score'] = min(100, base_score + bonus_points)
-            program['has_bonus_match'] = bonus_points > 0
-
-            # Generate "Why This Matches" explanation
-            matches = []
-
-            # Farm type matches
-            if 'beef_cattle' in farm_type and criteria.get('livestock_beef_cattle'):
-                matches.append('Supports beef cattle operations')
-            if 'dairy_cattle' in farm_type and criteria.get('livestock_dairy_cattle'):
-                matches.append('Designed for dairy operations')
-            if 'hogs' in farm_type and criteria.get('livestock_hogs'):
-                matches.append('Available for hog producers')
-            if 'poultry' in farm_type and criteria.get('livestock_poultry'):
-                matches.append('Serves poultry farms')
-            if 'sheep_goats' in farm_type and criteria.get('livestock_sheep_goats'):
-                matches.append('Open to sheep and goat operations')
-            if 'bees' in farm_type and criteria.get('livestock_bees'):
-                matches.append('Supports beekeepers and honey producers')
-            if 'aquaculture' in farm_type and criteria.get('livestock_aquaculture'):
-                matches.append('Available for aquaculture operations')
-
-            if 'wheat' in farm_type and criteria.get('crop_wheat'):
-                matches.append('Covers wheat production')
-            if 'corn' in farm_type and criteria.get('crop_corn'):
-                matches.append('Includes corn crops')
-            if 'soybeans' in farm_type and criteria.get('crop_soybeans'):
-                matches.append('Applies to soybean farmers')
-            if 'cotton' in farm_type and criteria.get('crop_cotton'):
-                matches.append('Available for cotton growers')
-            if 'rice' in farm_type and criteria.get('crop_rice'):
-                matches.append('Covers rice production')
-            if 'barley' in farm_type and criteria.get('crop_barley'):
-                matches.append('Includes barley crops')
-            if 'sorghum' in farm_type and criteria.get('crop_sorghum'):
-                matches.append('Applies to sorghum/milo farmers')
-            if 'peanuts' in farm_type and criteria.get('crop_peanuts'):
-                matches.append('Available for peanut growers')
-            if 'sunflower' in farm_type and criteria.get('crop_sunflower'):
-                matches.append('Covers sunflower production')
-            if 'canola' in farm_type and criteria.get('crop_canola'):
-                matches.append('Includes canola/rapeseed')
-
-            if 'fruits' in farm_type and criteria.get('specialty_crop_fruits'):
-                matches.append('Supports fruit growers')
-            if 'vegetables' in farm_type and criteria.get('specialty_crop_vegetables'):
-                matches.append('Available for vegetable farmers')
-            if 'nuts' in farm_type and criteria.get('specialty_crop_nuts'):
-                matches.append('Covers nut tree operations')
-            if 'hay_forage' in farm_type and criteria.get('forage_hay'):
-                matches.append('Includes hay and forage producers')
-            if 'organic' in farm_type and criteria.get('organic'):
-                matches.append('Available for organic farmers')
-
-            # Program type matches
-            if 'loans' in program_type and criteria.get('is_loan'):
-                matches.append('Provides loan financing')
-            if 'payments' in program_type and criteria.get('is_payment'):
-                matches.append('Offers direct payments')
-            if 'insurance' in program_type and criteria.get('is_insurance'):
-                matches.append('Risk management/insurance program')
-            if 'conservation' in program_type and criteria.get('is_conservation'):
-                matches.append('Conservation-focused program')
-
-            # Farmer status matches (bonus)
-            if 'beginning' in farmer_status and criteria.get('beginning_farmer'):
-                matches.append('Prioritizes beginning farmers')
-            if 'young' in farmer_status and criteria.get('young_farmer'):
-                matches.append('Supports young farmers')
-            if 'veteran' in farmer_status and criteria.get('veteran'):
-                matches.append('Serves veteran farmers')
-
-            # Situation matches (bonus)
-            if 'disaster' in situation and criteria.get('is_disaster'):
-                matches.append('Provides disaster assistance')
-            if 'price_loss' in situation and criteria.get('for_price_loss'):
-                matches.append('Helps with price/market losses')
-            if 'need_equipment' in situation and criteria.get('for_equipment'):
-                matches.append('Can fund equipment purchases')
-            if 'buy_land' in situation and criteria.get('for_land_purchase'):
-                matches.append('Helps with land acquisition')
-
-            program['why_matches'] = matches
-
-            # Check eligibility requirements
-            if program.get('eligibility_requirements'):
-                requirements = program['eligibility_requirements'].get('requirements', [])
-                met = []
-                not_met = []
-                unknown = []
-
-                for req in requirements:
-                    req_key = req['key']
-                    status = 'unknown'  # default
-
-                    # Check each requirement against farm profile
-                    if req_key == 'is_us_citizen' and farm_profile['is_us_citizen']:
-                        status = 'met' if farm_profile['is_us_citizen'] == 'yes' else 'not_met' if farm_profile['is_us_citizen'] == 'no' else 'unknown'
-                    elif req_key == 'has_conservation_plan' and farm_profile['has_conservation_plan']:
-                        status = 'met' if farm_profile['has_conservation_plan'] == 'yes' else 'not_met' if farm_profile['has_conservation_plan'] == 'no' else 'unknown'
-                    elif req_key == 'has_satisfactory_credit' and farm_profile['credit_status']:
-                        status = 'met' if farm_profile['credit_status'] == 'good' else 'not_met' if farm_profile['credit_status'] == 'poor' else 'unknown'
-                    elif req_key == 'cannot_get_commercial_credit' and farm_profile['can_get_commercial_credit']:
-                        status = 'met' if farm_profile['can_get_commercial_credit'] == 'no' else 'not_met' if farm_profile['can_get_commercial_credit'] == 'yes' else 'unknown'
-                    elif req_key == 'is_beginning_farmer':
-                        status = 'met' if 'beginning' in farmer_status else 'unknown'
-                    elif req_key == 'is_veteran':
-                        status = 'met' if 'veteran' in farmer_status else 'unknown'
-                    elif req_key == 'is_socially_disadvantaged':
-                        # We don't collect this in the form yet, so it's always unknown
-                        status = 'unknown'
-                    elif req_key == 'meets_agi_limit' and farm_profile['gross_revenue']:
-                        # Typical AGI limit is $900,000
-                        status = 'met' if farm_profile['gross_revenue'] < 900000 else 'not_met'
-                    elif req_key == 'is_farm_owner' or req_key == 'owns_and_operates_farm':
-                        status = 'met' if farm_profile['owns_farm'] == 'yes' else 'not_met' if farm_profile['owns_farm'] == 'no' else 'unknown'
-                    elif req_key == 'operates_farm':
-                        # Assume they operate if they're using the finder
-                        status = 'met'
-
-                    req_with_status = {**req, 'status': status}
-                    if status == 'met':
-                        met.append(req_with_status)
-                    elif status == 'not_met':
-                        not_met.append(req_with_status)
-                    else:
-                        unknown.append(req_with_status)
-
-                program['eligibility_check'] = {
-                    'met': met,
-                    'not_met': not_met,
-                    'unknown': unknown,
-                    'total': len(requirements),
-                    'met_count': len(met),
-                    'not_met_count': len(not_met),
-                    'unknown_count': len(unknown),
-                    'score': round(len(met) / len(requirements) * 100) if requirements else 0
-                }
-
-        # Sort by match score
-        matched_programs.sort(key=lambda x: x['match_score'], reverse=True)
+        params = base_score_params + bonus_params + bonus_params + where_params + [FINDER_TOP_N]
+
+        # Same selections -> same SQL text, so repeat searches reuse the statement's plan
+        matched_programs = fetch_all_prepared(query, tuple(params))
+
+        # No candidates: skip the per-row explanation and eligibility passes entirely
+        if matched_programs:
+            # "Why This Matches" only cites the specific flag of each selected matcher
+            why_messages = [
+                (flags[0], message)
+                for _, flags, message in farm_type_matchers + program_type_matchers + bonus_matchers
+            ]
+
+            # Statuses depend only on the farm profile, so each check runs once per request
+            requirement_status = {
+                key: check(farm_profile, farmer_status_keys)
+                for key, check in REQUIREMENT_CHECKS.items()
+            }
+
+            for program in matched_programs:
+                add_display_fields(program)
+                criteria = program.get('eligibility_parsed')
+
+                # Generate "Why This Matches" explanation (nothing to cite without parsed criteria)
+                if criteria:
+                    program['why_matches'] = [message for flag, message in why_messages if criteria.get(flag)]
+                else:
+                    program['why_matches'] = []
+
+                # Check eligibility requirements (only the list is fetched and decoded)
+                requirements = program.pop('requirements')
+                if requirements is not None:
+                    total = len(requirements)
+                    met = []
+                    not_met = []
+                    unknown = []
+                    buckets = {'met': met, 'not_met': not_met, 'unknown': unknown}
+
+                    # Rows are decoded fresh per query, so each requirement can be tagged in place
+                    for req in requirements:
+                        status = requirement_status.get(req['key'], 'unknown')
+                        req['status'] = status
+                        buckets[status].append(req)
+
+                    program['eligibility_check'] = {
+                        'met': met,
+                        'not_met': not_met,
+                        'unknown': unknown,
+                        'total': total,
+                        'met_count': len(met),
+                        'not_met_count': len(not_met),
+                        'unknown_count': len(unknown),
+                        # Percentage rounded half-up in integer arithmetic
+                        'score': (len(met) * 200 + total) // (2 * total) if total else 0
+                    }
 
     return render_template('finder.html',
                          matched_programs=matched_programs,
@@ -713,6 +888,11 @@ def finder():
                          farm_profile=farm_profile)
 
 
+# Selected programs shown on /my-programs; longer ID lists are rejected outright
+MAX_MY_PROGRAMS = 200
+MY_PROGRAMS_HARD_LIMIT = 500
+
+
 @app.route('/my-programs')
 def my_programs():
     """Display user's selected programs with next steps and payment estimates"""
@@ -724,15 +904,27 @@ def my_programs():
         # No programs selected yet
         return render_template('my_programs.html', programs=[])
 
-    # Parse comma-separated IDs
-    id_list = [int(id.strip()) for id in program_ids.split(',') if id.strip().isdigit()]
+    # Parse comma-separated IDs (deduped, first-seen order, capped)
+    raw_ids = program_ids.split(',')
+    if len(raw_ids) > MY_PROGRAMS_HARD_LIMIT:
+        return "Too many programs selected", 400
+
+    id_list = list(dict.fromkeys(int(id.strip()) for id in raw_ids if id.strip().isdigit()))[:MAX_MY_PROGRAMS]
 
     if not id_list:
         return render_template('my_programs.html', programs=[])
 
-    # Fetch full program details for selected programs
-    placeholders = ','.join(['%s'] * len(id_list))
-    query = f"""
+    # Results are sorted by name, so the ID set (not its order) is the cache key
+    programs = _fetch_my_programs(get_data_version(), frozenset(id_list))
+
+    return render_template('my_programs.html', programs=programs)
+
+
+@cached(TTLCache(maxsize=256, ttl=AGGREGATE_CACHE_TTL_SECONDS), lock=threading.Lock())
+def _fetch_my_programs(version, program_ids):
+    """Full program details for a set of selected program IDs"""
+    # One array parameter, whatever the count
+    return fetch_all("""
         SELECT
             id,
             program_name,
@@ -747,13 +939,20 @@ def my_programs():
             ai_summary,
             confidence_score
         FROM programs
-        WHERE id IN ({placeholders})
+        WHERE id = ANY(%s)
         ORDER BY program_name
-    """
+    """, (sorted(program_ids),))
 
-    programs = db.fetch_all(query, tuple(id_list))
 
-    return render_template('my_programs.html', programs=programs)
+# Successful database probes are reused this long; failures are never cached
+HEALTH_CACHE_TTL_SECONDS = 2
+
+
+@cached(TTLCache(maxsize=1, ttl=HEALTH_CACHE_TTL_SECONDS), lock=threading.Lock())
+def _probe_database():
+    """Round-trip to the database (raises if it is unreachable)"""
+    fetch_one("SELECT 1")
+    return True
 
 
 @app.route('/health')
@@ -761,7 +960,7 @@ def health_check():
     """Health check endpoint for load balancers and monitoring"""
     try:
         # Test database connection
-        db.fetch_one("SELECT 1")
+        _probe_database()
         return jsonify({"status": "healthy", "database": "connected"}), 200
     except Exception as e:
         return jsonify({"status": "unhealthy", "error": str(e)}), 503
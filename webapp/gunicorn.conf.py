@@ -0,0 +1,34 @@
+"""
+Gunicorn configuration for the FSA Program Explorer web app
+
+Each worker process runs `threads` request threads and owns its own database
+connection pool. A request holds at most one pooled connection, so the pool
+is sized to the thread count:
+
+    total database connections = workers x threads
+
+Keep that product under the database's connection limit (the managed dev
+database allows ~20 client connections).
+"""
+import logging
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = 120
+
+# One pooled connection per request thread (ThreadedConnectionPool raises instead of
+# blocking when exhausted, so the pool must never be smaller than the thread count)
+os.environ.setdefault('DB_POOL_MAX_CONNECTIONS', str(threads))
+os.environ.setdefault('DB_POOL_MIN_CONNECTIONS', str(min(4, threads)))
+
+
+def post_fork(server, worker):
+    """Per-worker setup: logging, and no database connections shared with the master"""
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO'))
+
+    from src.database.connection import db
+    db.close()